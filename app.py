@@ -21,7 +21,7 @@ import sys
 import json
 import time
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 import argparse
 from datetime import datetime
 import traceback
@@ -71,7 +71,9 @@ class CustomerSupportAI:
             handlers=[
                 logging.StreamHandler(),
                 logging.FileHandler(os.getenv("LOG_FILE", "customer_support.log"))
-            ]
+            ],
+            # Replace the default handlers installed when the tool modules were imported
+            force=True
         )
         self.logger = logging.getLogger("CustomerSupportAI")
         
@@ -82,7 +84,8 @@ class CustomerSupportAI:
         self.llm = LLMInterface(
             base_url=self.ollama_url,
             model=self.model_name,
-            simulate=simulate
+            simulate=simulate,
+            preload=True
         )
         
         self.logger.info(f"Initialized LLM interface with model: {self.model_name}")
@@ -116,13 +119,15 @@ class CustomerSupportAI:
         # Initialize data processor
         self.data_processor = DataProcessor()
     
-    def process_conversation(self, conversation: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
+    def process_conversation(self, conversation: Dict[str, Any], verbose: bool = False,
+                             raw_data: Optional[Union[str, bytes]] = None) -> Dict[str, Any]:
         """
         Process a customer support conversation through the complete pipeline
         
         Args:
             conversation: The conversation to process
             verbose: Whether to print detailed processing information
+            raw_data: Optional original JSON payload of the conversation, stored as-is
             
         Returns:
             Dictionary with results from all agents
@@ -139,7 +144,7 @@ class CustomerSupportAI:
         
         try:
             # Store the conversation in the database
-            self.db.store_conversation(conversation)
+            self.db.store_conversation(conversation, raw_data_bytes=raw_data)
             
             # Analyze sentiment (new feature)
             sentiment_results = self.sentiment_analyzer.analyze_conversation_sentiment(conversation)
@@ -195,7 +200,8 @@ class CustomerSupportAI:
             if not knowledge_articles and self.kb_url:
                 knowledge_articles = self.web_scraper.search_knowledge_base(self.kb_url, search_query)
             
-            results["knowledge_articles"] = knowledge_articles
+            # Copy the shared read-only articles into plain dicts for the results
+            results["knowledge_articles"] = [dict(article) for article in knowledge_articles]
             results["processing_time"]["steps"]["knowledge_retrieval"] = time.time() - step_start
             
             if verbose and knowledge_articles:
@@ -233,7 +239,7 @@ class CustomerSupportAI:
                 
                 similar_conversations = []  # Initialize empty list as default
                 
-                if embedding:
+                if embedding is not None and embedding.size:
                     # Store embedding in the database
                     self.db.store_embedding(
                         source_type="conversation",
@@ -69,20 +69,21 @@ def add_sample_embeddings(db: Database) -> None:
         "Feature request for new functionality"
     ]
     
-    # Simulate embeddings (10-dimensional vectors)
+    # Simulate embeddings (10-dimensional vectors), committed together
     import random
-    for i, text in enumerate(sample_texts):
-        # Create a sample embedding vector
-        embedding = [random.random() for _ in range(10)]
-        
-        # Store the embedding
-        db.store_embedding(
-            source_type="sample",
-            source_id=f"sample-{i}",
-            text=text,
-            embedding=embedding,
-            model="sample-model"
-        )
+    with db.batch():
+        for i, text in enumerate(sample_texts):
+            # Create a sample embedding vector
+            embedding = [random.random() for _ in range(10)]
+            
+            # Store the embedding
+            db.store_embedding(
+                source_type="sample",
+                source_id=f"sample-{i}",
+                text=text,
+                embedding=embedding,
+                model="sample-model"
+            )
 
 def main():
     """Main entry point for the script"""
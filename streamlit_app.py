@@ -39,8 +39,9 @@ page = st.sidebar.radio("Go to", ["Analyze Conversation", "Sample Results", "Abo
 def parse_custom_conversation(text):
     lines = text.strip().split('\n')
     
-    # Initialize variables
-    conversation_id = "custom_" + str(int(time.time()))
+    # Initialize variables (the ID is assigned after parsing when the text has none,
+    # so the result depends on the text alone and can be cached)
+    conversation_id = ""
     category = "Unknown"
     sentiment = "Unknown"
     priority = "Unknown"
@@ -103,6 +104,17 @@ def parse_custom_conversation(text):
     
     return conversation
 
+# Cache parsed conversations keyed on the raw text
+@st.cache_data(max_entries=16)
+def _parse_cached(text):
+    return parse_custom_conversation(text)
+
+def load_custom_conversation(text):
+    conversation = _parse_cached(text)
+    if not conversation["conversation_id"]:
+        conversation["conversation_id"] = "custom_" + str(int(time.time()))
+    return conversation
+
 # Function to display conversation
 def display_conversation(conversation):
     st.subheader("Conversation")
@@ -367,7 +379,7 @@ if page == "Analyze Conversation":
                     conversation = None
             else:
                 # Parse as text format
-                conversation = parse_custom_conversation(content)
+                conversation = load_custom_conversation(content)
                 st.success("Text file parsed successfully.")
             
             if conversation and st.button("Analyze Conversation"):
@@ -375,8 +387,9 @@ if page == "Analyze Conversation":
                     # Display the conversation
                     display_conversation(conversation)
                     
-                    # Process the conversation
-                    results = system.process_conversation(conversation, verbose=False)
+                    # Process the conversation, keeping the uploaded JSON as the stored payload
+                    raw_data = content if uploaded_file.name.endswith(".json") else None
+                    results = system.process_conversation(conversation, verbose=False, raw_data=raw_data)
                     
                     # Display the results
                     display_results(results)
@@ -388,7 +401,7 @@ if page == "Analyze Conversation":
         if conversation_text and st.button("Analyze Text"):
             with st.spinner("Processing conversation..."):
                 # Parse the text
-                conversation = parse_custom_conversation(conversation_text)
+                conversation = load_custom_conversation(conversation_text)
                 
                 # Display the conversation
                 display_conversation(conversation)
@@ -1,15 +1,178 @@
 import os
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import logging
+import re
 import time
-from typing import Dict, Any, Optional, List, Union
+from functools import lru_cache
+from urllib.parse import urlencode, urljoin
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Iterable, List, Mapping, Sequence, Tuple, Union
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+from lxml import etree
+from lxml import html as lxml_html
+
+try:
+    import aiohttp
+except ImportError:
+    # Optional; WebScraper.fetch_many falls back to sequential fetches
+    aiohttp = None
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional accelerator; SentimentAnalyzer falls back to a token scan
+    ahocorasick = None
+
+# Runs of letters/digits; matches the word boundaries used by the automaton scan
+_WORD_RE = re.compile(r"[^\W_]+")
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Set up logging once for all tools, unless the application already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, 
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains the given class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Compiled XPath queries used by WebScraper
+_TITLE_XP = etree.XPath("string(//title)")
+_ARTICLE_XP = etree.XPath("//article")
+_MAIN_DIV_XP = etree.XPath("//div[{}]".format(" or ".join(
+    _has_class(name) for name in ("content", "main", "article", "post")
+)))
+_BODY_XP = etree.XPath("//body")
+
+# Same main content div match as _MAIN_DIV_XP, for the BeautifulSoup fallback
+_MAIN_DIV_CSS = "div.content, div.main, div.article, div.post"
+_META_XP = etree.XPath("//meta[@name != '' and @content != '']")
+_SEARCH_RESULT_XP = etree.XPath(f"//div[{_has_class('search-result')}]")
+_SNIPPET_XP = etree.XPath(f".//div[{_has_class('snippet')}]")
+
+# Preloaded knowledge base articles, built once at import and shared by reference
+def _freeze_articles(articles: List[Dict[str, Any]]) -> Tuple[Mapping[str, Any], ...]:
+    """Wrap articles in read-only mappings so the same objects can be returned on every call"""
+    return tuple(MappingProxyType(article) for article in articles)
+
+_BILLING_ARTICLES = _freeze_articles([
+    {
+        "title": "Billing and Refund Process",
+        "content": "Standard process for handling duplicate charges: 1) Verify the duplicate charge in billing history 2) Initiate refund through the billing system 3) Send confirmation email to customer 4) Monitor account for similar issues",
+        "url": "https://example.com/help/billing-refund",
+        "relevance": 0.95
+    },
+    {
+        "title": "Subscription Billing Issues",
+        "content": "Common subscription billing issues and resolutions: - Duplicate charges during system maintenance - Failed payments - Subscription renewal problems - Refund processing times",
+        "url": "https://example.com/help/subscription-billing",
+        "relevance": 0.90
+    },
+    {
+        "title": "Customer Account Monitoring",
+        "content": "Best practices for monitoring customer accounts: 1) Set up alerts for unusual billing patterns 2) Document all billing-related issues 3) Regular account review for high-risk customers",
+        "url": "https://example.com/help/account-monitoring",
+        "relevance": 0.85
+    }
+])
+
+_TECHNICAL_ARTICLES = _freeze_articles([
+    {
+        "title": "Common Technical Issues and Solutions",
+        "content": "Troubleshooting steps for common technical problems: 1) Clear browser cache 2) Try a different network 3) Update software 4) Restart the application",
+        "url": "https://example.com/help/technical-issues",
+        "relevance": 0.95
+    },
+    {
+        "title": "Network Connectivity Problems",
+        "content": "Solutions for network-related errors: - Check internet connection - Verify firewall settings - Test alternative networks - Reset network settings",
+        "url": "https://example.com/help/network-connectivity",
+        "relevance": 0.90
+    },
+    {
+        "title": "Software Update Requirements",
+        "content": "Guide to updating software: 1) Check current version 2) Download latest update 3) Install update 4) Verify successful update",
+        "url": "https://example.com/help/software-updates",
+        "relevance": 0.85
+    }
+])
+
+_ACCOUNT_ARTICLES = _freeze_articles([
+    {
+        "title": "Account Access Troubleshooting",
+        "content": "Steps to resolve login issues: 1) Reset password 2) Verify email address 3) Check account status 4) Clear browser cookies",
+        "url": "https://example.com/help/account-access",
+        "relevance": 0.95
+    },
+    {
+        "title": "Password Reset Process",
+        "content": "How to reset your password: - Use the forgot password link - Check your email for the reset link - Create a strong new password - Update password in all devices",
+        "url": "https://example.com/help/password-reset",
+        "relevance": 0.90
+    },
+    {
+        "title": "Account Security Best Practices",
+        "content": "Recommendations for account security: 1) Use strong passwords 2) Enable two-factor authentication 3) Monitor account activity 4) Sign out from shared devices",
+        "url": "https://example.com/help/account-security",
+        "relevance": 0.85
+    }
+])
+
+_GENERAL_ARTICLES = _freeze_articles([
+    {
+        "title": "Customer Support Guide",
+        "content": "Overview of customer support services: 1) Chat support 2) Email support 3) Phone support 4) Self-service options",
+        "url": "https://example.com/help/support-guide",
+        "relevance": 0.80
+    },
+    {
+        "title": "Frequently Asked Questions",
+        "content": "Answers to common questions about our products and services",
+        "url": "https://example.com/help/faq",
+        "relevance": 0.75
+    },
+    {
+        "title": "Contact Information",
+        "content": "How to reach different support departments: - Technical support - Billing support - Account management - General inquiries",
+        "url": "https://example.com/help/contact",
+        "relevance": 0.70
+    }
+])
+
+_ARTICLES_BY_BUCKET = {
+    "billing": _BILLING_ARTICLES,
+    "technical": _TECHNICAL_ARTICLES,
+    "account": _ACCOUNT_ARTICLES,
+    "general": _GENERAL_ARTICLES
+}
+
+# Query keywords mapped to article buckets, checked in this priority order
+_BUCKET_KEYWORDS = {
+    "billing": ("billing", "charge", "refund"),
+    "technical": ("technical", "error", "issue"),
+    "account": ("account", "login", "password")
+}
+_KEYWORD_BUCKETS = {keyword: bucket for bucket, keywords in _BUCKET_KEYWORDS.items() for keyword in keywords}
+_BUCKET_RE = re.compile("|".join(_KEYWORD_BUCKETS), re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _classify_query(query: str) -> str:
+    """Return the article bucket for a query, scanning it once for all keywords"""
+    buckets = {_KEYWORD_BUCKETS[keyword.lower()] for keyword in _BUCKET_RE.findall(query)}
+    for bucket in _BUCKET_KEYWORDS:
+        if bucket in buckets:
+            return bucket
+    return "general"
+
+
 class APIClient:
     """Client for interacting with external APIs for knowledge base access"""
     
@@ -26,11 +189,9 @@ class APIClient:
         self.api_key = None
         
         # Set up logging
-        logging.basicConfig(level=logging.INFO, 
-                           format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger("APIClient")
     
-    def get_knowledge_articles(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+    def get_knowledge_articles(self, query: str, max_results: int = 5) -> Sequence[Mapping[str, Any]]:
         """
         Return preloaded knowledge base articles related to a query
         
@@ -39,112 +200,30 @@ class APIClient:
             max_results: Maximum number of results to return
             
         Returns:
-            List of knowledge articles
+            Shared, read-only sequence of knowledge articles; the same objects are
+            returned on every call, so callers that need to modify an article must
+            copy it first with dict(article)
         """
         self.logger.info(f"Retrieving local knowledge articles for query: {query}")
         
         # Determine which set of articles to return based on query keywords
-        if "billing" in query.lower() or "charge" in query.lower() or "refund" in query.lower():
-            return self._get_billing_articles()
-        elif "technical" in query.lower() or "error" in query.lower() or "issue" in query.lower():
-            return self._get_technical_articles()
-        elif "account" in query.lower() or "login" in query.lower() or "password" in query.lower():
-            return self._get_account_articles()
-        else:
-            # Default to generic articles
-            return self._get_general_articles()
+        return _ARTICLES_BY_BUCKET[_classify_query(query)]
     
-    def _get_billing_articles(self) -> List[Dict[str, Any]]:
+    def _get_billing_articles(self) -> Tuple[Mapping[str, Any], ...]:
         """Return preloaded billing-related articles"""
-        return [
-            {
-                "title": "Billing and Refund Process",
-                "content": "Standard process for handling duplicate charges: 1) Verify the duplicate charge in billing history 2) Initiate refund through the billing system 3) Send confirmation email to customer 4) Monitor account for similar issues",
-                "url": "https://example.com/help/billing-refund",
-                "relevance": 0.95
-            },
-            {
-                "title": "Subscription Billing Issues",
-                "content": "Common subscription billing issues and resolutions: - Duplicate charges during system maintenance - Failed payments - Subscription renewal problems - Refund processing times",
-                "url": "https://example.com/help/subscription-billing",
-                "relevance": 0.90
-            },
-            {
-                "title": "Customer Account Monitoring",
-                "content": "Best practices for monitoring customer accounts: 1) Set up alerts for unusual billing patterns 2) Document all billing-related issues 3) Regular account review for high-risk customers",
-                "url": "https://example.com/help/account-monitoring",
-                "relevance": 0.85
-            }
-        ]
+        return _BILLING_ARTICLES
     
-    def _get_technical_articles(self) -> List[Dict[str, Any]]:
+    def _get_technical_articles(self) -> Tuple[Mapping[str, Any], ...]:
         """Return preloaded technical articles"""
-        return [
-            {
-                "title": "Common Technical Issues and Solutions",
-                "content": "Troubleshooting steps for common technical problems: 1) Clear browser cache 2) Try a different network 3) Update software 4) Restart the application",
-                "url": "https://example.com/help/technical-issues",
-                "relevance": 0.95
-            },
-            {
-                "title": "Network Connectivity Problems",
-                "content": "Solutions for network-related errors: - Check internet connection - Verify firewall settings - Test alternative networks - Reset network settings",
-                "url": "https://example.com/help/network-connectivity",
-                "relevance": 0.90
-            },
-            {
-                "title": "Software Update Requirements",
-                "content": "Guide to updating software: 1) Check current version 2) Download latest update 3) Install update 4) Verify successful update",
-                "url": "https://example.com/help/software-updates",
-                "relevance": 0.85
-            }
-        ]
+        return _TECHNICAL_ARTICLES
     
-    def _get_account_articles(self) -> List[Dict[str, Any]]:
+    def _get_account_articles(self) -> Tuple[Mapping[str, Any], ...]:
         """Return preloaded account-related articles"""
-        return [
-            {
-                "title": "Account Access Troubleshooting",
-                "content": "Steps to resolve login issues: 1) Reset password 2) Verify email address 3) Check account status 4) Clear browser cookies",
-                "url": "https://example.com/help/account-access",
-                "relevance": 0.95
-            },
-            {
-                "title": "Password Reset Process",
-                "content": "How to reset your password: - Use the forgot password link - Check your email for the reset link - Create a strong new password - Update password in all devices",
-                "url": "https://example.com/help/password-reset",
-                "relevance": 0.90
-            },
-            {
-                "title": "Account Security Best Practices",
-                "content": "Recommendations for account security: 1) Use strong passwords 2) Enable two-factor authentication 3) Monitor account activity 4) Sign out from shared devices",
-                "url": "https://example.com/help/account-security",
-                "relevance": 0.85
-            }
-        ]
+        return _ACCOUNT_ARTICLES
     
-    def _get_general_articles(self) -> List[Dict[str, Any]]:
+    def _get_general_articles(self) -> Tuple[Mapping[str, Any], ...]:
         """Return general knowledge articles"""
-        return [
-            {
-                "title": "Customer Support Guide",
-                "content": "Overview of customer support services: 1) Chat support 2) Email support 3) Phone support 4) Self-service options",
-                "url": "https://example.com/help/support-guide",
-                "relevance": 0.80
-            },
-            {
-                "title": "Frequently Asked Questions",
-                "content": "Answers to common questions about our products and services",
-                "url": "https://example.com/help/faq",
-                "relevance": 0.75
-            },
-            {
-                "title": "Contact Information",
-                "content": "How to reach different support departments: - Technical support - Billing support - Account management - General inquiries",
-                "url": "https://example.com/help/contact",
-                "relevance": 0.70
-            }
-        ]
+        return _GENERAL_ARTICLES
     
     def get_entity_information(self, entity_type: str, entity_id: str) -> Dict[str, Any]:
         """
@@ -197,12 +276,28 @@ class WebScraper:
         """
         self.user_agent = user_agent or "CustomerSupportAI/1.0"
         
+        # Reuse pooled keep-alive connections across requests
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = self.user_agent
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
         # Set up logging
-        logging.basicConfig(level=logging.INFO, 
-                           format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger("WebScraper")
     
-    def fetch_page(self, url: str) -> Optional[str]:
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections"""
+        self._session.close()
+    
+    def __enter__(self) -> "WebScraper":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def fetch_page(self, url: str) -> Optional[bytes]:
         """
         Fetch the content of a web page
         
@@ -210,64 +305,135 @@ class WebScraper:
             url: URL of the page to fetch
             
         Returns:
-            HTML content of the page, or None if fetching failed
+            Raw HTML bytes of the page (decoded by the parser), or None if fetching failed
         """
         try:
-            headers = {
-                "User-Agent": self.user_agent
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
             
             self.logger.info(f"Fetched page: {url}")
-            return response.text
+            return response.content
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching page {url}: {e}")
             return None
     
-    def extract_article_content(self, html: str) -> Dict[str, Any]:
+    async def fetch_pages(self, urls: List[str]) -> List[Optional[bytes]]:
+        """
+        Fetch several web pages concurrently (requires aiohttp)
+        
+        Args:
+            urls: URLs of the pages to fetch
+            
+        Returns:
+            Raw HTML bytes for each URL in the same order, with None for pages that failed
+        """
+        semaphore = asyncio.Semaphore(16)
+        
+        async def fetch(session: "aiohttp.ClientSession", url: str) -> Optional[bytes]:
+            async with semaphore:
+                try:
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        content = await response.read()
+                    
+                    self.logger.info(f"Fetched page: {url}")
+                    return content
+                    
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.logger.error(f"Error fetching page {url}: {e}")
+                    return None
+        
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32),
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={"User-Agent": self.user_agent}
+        ) as session:
+            return await asyncio.gather(*(fetch(session, url) for url in urls))
+    
+    def fetch_many(self, urls: List[str]) -> List[Optional[bytes]]:
+        """
+        Fetch several web pages, concurrently when aiohttp is available
+        
+        Must not be called from a running event loop; await fetch_pages there instead.
+        
+        Args:
+            urls: URLs of the pages to fetch
+            
+        Returns:
+            Raw HTML bytes for each URL in the same order, with None for pages that failed
+        """
+        if not urls:
+            return []
+        if aiohttp is None:
+            return [self.fetch_page(url) for url in urls]
+        return asyncio.run(self.fetch_pages(urls))
+    
+    def fetch_page_tree(self, url: str) -> Optional[etree._Element]:
+        """
+        Fetch a web page and parse it incrementally as the body is downloaded
+        
+        Args:
+            url: URL of the page to fetch
+            
+        Returns:
+            Root element of the parsed page, or None if fetching or parsing failed
+        """
+        try:
+            with self._session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                
+                # Use the charset from the headers if given, otherwise let lxml detect it
+                content_type = response.headers.get("Content-Type", "").lower()
+                encoding = response.encoding if "charset" in content_type else None
+                
+                # Feed chunks to the parser while the rest of the body is still arriving
+                parser = lxml_html.HTMLParser(encoding=encoding)
+                for chunk in response.iter_content(chunk_size=16384):
+                    parser.feed(chunk)
+                tree = parser.close()
+            
+            self.logger.info(f"Fetched page: {url}")
+            return tree
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error fetching page {url}: {e}")
+            return None
+        except etree.LxmlError as e:
+            self.logger.error(f"Error parsing page {url}: {e}")
+            return None
+    
+    def extract_article_content(self, html: Union[str, bytes]) -> Dict[str, Any]:
         """
         Extract article content from HTML
         
         Args:
-            html: HTML content to parse
+            html: HTML content to parse, as text or raw bytes (encoding is detected by the parser)
             
         Returns:
             Dictionary with title, content, and metadata
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            try:
+                tree = lxml_html.fromstring(html)
+            except (etree.ParserError, ValueError) as e:
+                self.logger.warning(f"lxml could not parse page, falling back to BeautifulSoup: {e}")
+                return self._extract_article_content_soup(html)
             
             # Extract title
-            title = ""
-            title_tag = soup.find('title')
-            if title_tag:
-                title = title_tag.text.strip()
+            title = _TITLE_XP(tree).strip()
             
-            # Extract main content (this is a simplistic approach)
+            # Extract main content (this is a simplistic approach):
+            # article tag, then main content div, then body
             content = ""
-            article_tag = soup.find('article')
-            if article_tag:
-                content = article_tag.text.strip()
-            else:
-                # Try to find main content div
-                main_content = soup.find('div', {'class': ['content', 'main', 'article', 'post']})
-                if main_content:
-                    content = main_content.text.strip()
-                else:
-                    # Fallback to body
-                    body = soup.find('body')
-                    if body:
-                        content = body.text.strip()
+            for xpath in (_ARTICLE_XP, _MAIN_DIV_XP, _BODY_XP):
+                elements = xpath(tree)
+                if elements:
+                    content = elements[0].text_content().strip()
+                    break
             
             # Extract metadata
-            metadata = {}
-            meta_tags = soup.find_all('meta')
-            for tag in meta_tags:
-                if tag.get('name') and tag.get('content'):
-                    metadata[tag['name']] = tag['content']
+            metadata = {tag.get('name'): tag.get('content') for tag in _META_XP(tree)}
             
             return {
                 "title": title,
@@ -283,47 +449,90 @@ class WebScraper:
                 "metadata": {}
             }
     
-    def search_knowledge_base(self, base_url: str, query: str) -> List[Dict[str, Any]]:
+    def _extract_article_content_soup(self, html: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Extract article content from HTML that lxml could not parse
+        
+        Args:
+            html: HTML content to parse
+            
+        Returns:
+            Dictionary with title, content, and metadata
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract title
+        title = ""
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.text.strip()
+        
+        # Extract main content (this is a simplistic approach)
+        content = ""
+        article_tag = soup.find('article')
+        if article_tag:
+            content = article_tag.text.strip()
+        else:
+            # Try to find main content div (first in document order matching any class)
+            main_content = soup.select_one(_MAIN_DIV_CSS)
+            if main_content:
+                content = main_content.text.strip()
+            else:
+                # Fallback to body
+                body = soup.find('body')
+                if body:
+                    content = body.text.strip()
+        
+        # Extract metadata
+        metadata = {}
+        meta_tags = soup.find_all('meta')
+        for tag in meta_tags:
+            if tag.get('name') and tag.get('content'):
+                metadata[tag['name']] = tag['content']
+        
+        return {
+            "title": title,
+            "content": content,
+            "metadata": metadata
+        }
+    
+    def search_knowledge_base(self, base_url: str, query: str, fetch_articles: bool = False) -> List[Dict[str, Any]]:
         """
         Search a knowledge base website for relevant articles
         
         Args:
             base_url: Base URL of the knowledge base
             query: Search query
+            fetch_articles: Whether to also download every result page (concurrently)
+                and add its extracted text as "content"
             
         Returns:
             List of relevant articles
         """
         try:
             # Format the search URL
-            search_url = f"{base_url}/search?q={query.replace(' ', '+')}"
+            search_url = urljoin(base_url.rstrip('/') + '/', 'search?' + urlencode({'q': query}))
             
-            # Fetch the search results page
-            html = self.fetch_page(search_url)
-            if not html:
+            # Fetch and parse the search results page
+            tree = self.fetch_page_tree(search_url)
+            if tree is None:
                 return []
             
-            # Parse the search results
-            soup = BeautifulSoup(html, 'html.parser')
-            
             # Extract search results (this is a generic approach that needs to be adapted for specific sites)
             results = []
-            result_elements = soup.find_all('div', {'class': 'search-result'})
-            
-            for element in result_elements:
-                title_tag = element.find('h3')
-                link_tag = element.find('a')
-                snippet_tag = element.find('div', {'class': 'snippet'})
+            for element in _SEARCH_RESULT_XP(tree):
+                title_tags = element.xpath('.//h3')
+                link_tags = element.xpath('.//a')
+                snippet_tags = _SNIPPET_XP(element)
                 
-                if title_tag and link_tag:
-                    title = title_tag.text.strip()
-                    url = link_tag.get('href', '')
-                    if not url.startswith('http'):
-                        url = base_url + url
+                if title_tags and link_tags:
+                    title = title_tags[0].text_content().strip()
+                    # Resolve relative, root-relative and protocol-relative links against the results page
+                    url = urljoin(search_url, link_tags[0].get('href', ''))
                     
                     snippet = ""
-                    if snippet_tag:
-                        snippet = snippet_tag.text.strip()
+                    if snippet_tags:
+                        snippet = snippet_tags[0].text_content().strip()
                     
                     results.append({
                         "title": title,
@@ -332,6 +541,13 @@ class WebScraper:
                     })
             
             self.logger.info(f"Found {len(results)} search results for query: {query}")
+            
+            if fetch_articles:
+                pages = self.fetch_many([result["url"] for result in results])
+                for result, page in zip(results, pages):
+                    if page:
+                        result["content"] = self.extract_article_content(page)["content"]
+            
             return results
             
         except Exception as e:
@@ -339,75 +555,218 @@ class WebScraper:
             return []
 
 
+# Simple lexicon of positive and negative words
+_POSITIVE_WORDS = frozenset({
+    "good", "great", "excellent", "amazing", "wonderful", "fantastic", "terrific",
+    "outstanding", "superb", "brilliant", "perfect", "happy", "pleased", "satisfied",
+    "impressed", "thankful", "appreciate", "helpful", "resolved", "solved", "fixed"
+})
+
+_NEGATIVE_WORDS = frozenset({
+    "bad", "terrible", "awful", "horrible", "disappointing", "poor", "inadequate",
+    "unacceptable", "frustrated", "annoyed", "angry", "upset", "unhappy", "dissatisfied",
+    "problem", "issue", "error", "failure", "broken", "useless", "waste", "difficult"
+})
+
+
+def _build_sentiment_automaton(positive_words, negative_words):
+    """Build an Aho-Corasick automaton tagging each lexicon word with its polarity"""
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for word in positive_words:
+        automaton.add_word(word, (1, word))
+    for word in negative_words:
+        automaton.add_word(word, (-1, word))
+    automaton.make_automaton()
+    return automaton
+
+
+# Sentiment labels indexed by the sign of the thresholded score
+_SENTIMENT_LABELS = ("negative", "neutral", "positive")
+
+# Single automaton over both lexicons so each text is scanned once
+_SENTIMENT_AUTOMATON = _build_sentiment_automaton(_POSITIVE_WORDS, _NEGATIVE_WORDS)
+
+# Built-in lexicons as (automaton, positive_words, negative_words)
+_DEFAULT_LEXICONS = (_SENTIMENT_AUTOMATON, _POSITIVE_WORDS, _NEGATIVE_WORDS)
+
+
+def _scan_lexicons(text_lower: str, automaton, positive_words, negative_words):
+    """
+    Yield (polarity, word) for every lexicon word in the text, in text order
+    
+    Args:
+        text_lower: Lowercased text to scan
+        automaton: Aho-Corasick automaton over both lexicons, or None to scan tokens
+        positive_words: Positive lexicon
+        negative_words: Negative lexicon
+    """
+    if automaton is None:
+        for word in _WORD_RE.findall(text_lower):
+            if word in positive_words:
+                yield 1, word
+            elif word in negative_words:
+                yield -1, word
+        return
+    
+    text_length = len(text_lower)
+    for end, (polarity, word) in automaton.iter(text_lower):
+        # Only count whole words, not matches inside longer words
+        start = end - len(word) + 1
+        if start > 0 and text_lower[start - 1].isalnum():
+            continue
+        if end + 1 < text_length and text_lower[end + 1].isalnum():
+            continue
+        yield polarity, word
+
+
+@lru_cache(maxsize=4096)
+def _tally_sentiment(text: str, lexicons: Tuple[Any, frozenset, frozenset]) -> Tuple[int, int, Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Count lexicon words in a text and collect up to 5 examples of each polarity
+    
+    Memoized on the raw text and the lexicons themselves (each automaton compares by
+    identity), so replaced lexicons simply age out of the cache; the result is immutable
+    so it can be shared.
+    
+    Args:
+        text: Text to scan
+        lexicons: (automaton, positive_words, negative_words) to scan with
+        
+    Returns:
+        Tuple of (positive_count, negative_count, positive_evidence, negative_evidence)
+    """
+    positive_count = 0
+    negative_count = 0
+    positive_evidence = []
+    negative_evidence = []
+    
+    for polarity, word in _scan_lexicons(text.lower(), *lexicons):
+        if polarity > 0:
+            positive_count += 1
+            if len(positive_evidence) < 5:  # Limit to 5 examples
+                positive_evidence.append(word)
+        else:
+            negative_count += 1
+            if len(negative_evidence) < 5:  # Limit to 5 examples
+                negative_evidence.append(word)
+    
+    return positive_count, negative_count, tuple(positive_evidence), tuple(negative_evidence)
+
+
 class SentimentAnalyzer:
     """Sentiment analysis tool using basic lexicon-based approach"""
     
+    # (automaton, positive_words, negative_words) used for tallies; the built-in ones are
+    # shared by all instances, and set_lexicons replaces them as a whole
+    _lexicons = _DEFAULT_LEXICONS
+    
     def __init__(self):
         """Initialize the sentiment analyzer"""
-        # Simple lexicon of positive and negative words
-        self.positive_words = set([
-            "good", "great", "excellent", "amazing", "wonderful", "fantastic", "terrific",
-            "outstanding", "superb", "brilliant", "perfect", "happy", "pleased", "satisfied",
-            "impressed", "thankful", "appreciate", "helpful", "resolved", "solved", "fixed"
-        ])
-        
-        self.negative_words = set([
-            "bad", "terrible", "awful", "horrible", "disappointing", "poor", "inadequate",
-            "unacceptable", "frustrated", "annoyed", "angry", "upset", "unhappy", "dissatisfied",
-            "problem", "issue", "error", "failure", "broken", "useless", "waste", "difficult"
-        ])
-        
         # Set up logging
-        logging.basicConfig(level=logging.INFO, 
-                           format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger("SentimentAnalyzer")
     
-    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+    def set_lexicons(self, positive_words: Optional[Iterable[str]] = None,
+                     negative_words: Optional[Iterable[str]] = None) -> None:
         """
-        Analyze the sentiment of a text
+        Replace this analyzer's positive and/or negative lexicon
         
         Args:
-            text: Text to analyze
+            positive_words: New positive lexicon (unchanged if None)
+            negative_words: New negative lexicon (unchanged if None)
+        """
+        _, positive, negative = self._lexicons
+        if positive_words is not None:
+            positive = frozenset(word.lower() for word in positive_words)
+        if negative_words is not None:
+            negative = frozenset(word.lower() for word in negative_words)
+        self._lexicons = (_build_sentiment_automaton(positive, negative), positive, negative)
+    
+    @property
+    def positive_words(self) -> frozenset:
+        """Positive lexicon; assigning to it goes through set_lexicons"""
+        return self._lexicons[1]
+    
+    @positive_words.setter
+    def positive_words(self, words: Iterable[str]) -> None:
+        self.set_lexicons(positive_words=words)
+    
+    @property
+    def negative_words(self) -> frozenset:
+        """Negative lexicon; assigning to it goes through set_lexicons"""
+        return self._lexicons[2]
+    
+    @negative_words.setter
+    def negative_words(self, words: Iterable[str]) -> None:
+        self.set_lexicons(negative_words=words)
+    
+    def _tally(self, text: str) -> Tuple[int, int, List[str], List[str]]:
+        """
+        Count lexicon words in a text and collect up to 5 examples of each polarity
+        
+        Args:
+            text: Text to scan
             
         Returns:
-            Dictionary with sentiment analysis results
+            Tuple of (positive_count, negative_count, positive_evidence, negative_evidence)
         """
-        # Convert to lowercase and split into words
-        words = text.lower().split()
-        
-        # Count positive and negative words
-        positive_count = sum(1 for word in words if word in self.positive_words)
-        negative_count = sum(1 for word in words if word in self.negative_words)
+        positive_count, negative_count, positive_evidence, negative_evidence = \
+            _tally_sentiment(text, self._lexicons)
+        return positive_count, negative_count, list(positive_evidence), list(negative_evidence)
+    
+    def _score_msg(self, content: str) -> Tuple[Tuple[int, int, List[str], List[str]], Dict[str, Any]]:
+        """
+        Score a single message
         
-        # Calculate sentiment score (-1 to 1)
+        Args:
+            content: Message text
+            
+        Returns:
+            Tuple of (tally, result) where tally is as returned by _tally and result
+            is the per-message sentiment dictionary
+        """
+        tally = self._tally(content)
+        return tally, self._build_result(*tally)
+    
+    @staticmethod
+    def _build_result(positive_count: int, negative_count: int,
+                      positive_evidence: List[str], negative_evidence: List[str]) -> Dict[str, Any]:
+        """Build a sentiment result dictionary from word counts and evidence"""
         total_count = positive_count + negative_count
-        if total_count == 0:
-            sentiment_score = 0
-        else:
-            sentiment_score = (positive_count - negative_count) / total_count
         
-        # Determine sentiment label
-        if sentiment_score > 0.2:
-            sentiment = "positive"
-        elif sentiment_score < -0.2:
-            sentiment = "negative"
-        else:
-            sentiment = "neutral"
+        # Determine sentiment label with integer comparisons only:
+        # score > 0.2 <=> 5 * (pos - neg) > total, and score < -0.2 <=> -5 * (pos - neg) > total
+        diff5 = 5 * (positive_count - negative_count)
+        sentiment = _SENTIMENT_LABELS[(diff5 > total_count) - (-diff5 > total_count) + 1]
         
-        # Get supporting evidence
-        positive_evidence = [word for word in words if word in self.positive_words]
-        negative_evidence = [word for word in words if word in self.negative_words]
+        # Calculate sentiment score (-1 to 1)
+        sentiment_score = (positive_count - negative_count) / total_count if total_count else 0
         
-        result = {
+        return {
             "sentiment": sentiment,
             "score": sentiment_score,
             "positive_count": positive_count,
             "negative_count": negative_count,
-            "positive_evidence": positive_evidence[:5],  # Limit to 5 examples
-            "negative_evidence": negative_evidence[:5]   # Limit to 5 examples
+            "positive_evidence": positive_evidence,
+            "negative_evidence": negative_evidence
         }
+    
+    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze the sentiment of a text
         
-        self.logger.info(f"Analyzed sentiment: {sentiment} (score: {sentiment_score:.2f})")
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Dictionary with sentiment analysis results
+        """
+        # Count positive and negative words and collect evidence in a single pass
+        result = self._build_result(*self._tally(text))
+        
+        self.logger.info(f"Analyzed sentiment: {result['sentiment']} (score: {result['score']:.2f})")
         return result
     
     def analyze_conversation_sentiment(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
@@ -425,23 +784,39 @@ class SentimentAnalyzer:
             return {"error": "Invalid conversation format"}
         
         # Analyze customer messages only
-        customer_messages = [msg.get("content", "") 
-                           for msg in conversation["messages"] 
-                           if msg.get("sender", "").lower() == "customer"]
+        customer_messages = [(msg.get("timestamp", ""), msg.get("content", ""))
+                             for msg in conversation["messages"]
+                             if msg.get("sender", "").lower() == "customer"]
         
-        customer_text = " ".join(customer_messages)
-        overall_sentiment = self.analyze_sentiment(customer_text)
+        # Score each message once; the overall sentiment is derived from the summed
+        # counts instead of re-scanning the joined customer text
+        overall_positive = 0
+        overall_negative = 0
+        overall_positive_evidence = []
+        overall_negative_evidence = []
+        
+        # Score messages serially: scanning holds the GIL, so a thread pool only adds overhead
+        scores = [self._score_msg(content) for _, content in customer_messages]
         
         # Track sentiment changes over time
         sentiment_progression = []
-        for msg in conversation["messages"]:
-            if msg.get("sender", "").lower() == "customer":
-                message_sentiment = self.analyze_sentiment(msg.get("content", ""))
-                sentiment_progression.append({
-                    "timestamp": msg.get("timestamp", ""),
-                    "sentiment": message_sentiment["sentiment"],
-                    "score": message_sentiment["score"]
-                })
+        for (timestamp, _), (tally, message_sentiment) in zip(customer_messages, scores):
+            positive_count, negative_count, positive_evidence, negative_evidence = tally
+            sentiment_progression.append({
+                "timestamp": timestamp,
+                "sentiment": message_sentiment["sentiment"],
+                "score": message_sentiment["score"]
+            })
+            
+            overall_positive += positive_count
+            overall_negative += negative_count
+            overall_positive_evidence.extend(positive_evidence[:5 - len(overall_positive_evidence)])
+            overall_negative_evidence.extend(negative_evidence[:5 - len(overall_negative_evidence)])
+        
+        overall_sentiment = self._build_result(overall_positive, overall_negative,
+                                               overall_positive_evidence, overall_negative_evidence)
+        self.logger.info(f"Analyzed conversation sentiment: {overall_sentiment['sentiment']} "
+                         f"(score: {overall_sentiment['score']:.2f})")
         
         # Detect sentiment shifts
         sentiment_shifts = []
@@ -1,14 +1,72 @@
 import json
-from typing import Dict, List, Any, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
-import nltk
-from nltk.tokenize import sent_tokenize
 
-# Download NLTK resources if not already present
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+    import orjson
+except ImportError:
+    # Optional; load_conversation falls back to the stdlib json module
+    orjson = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    # Optional; load_historical_data falls back to pd.read_csv
+    pa = None
+
+# Random generator used to sample historical records
+_RNG = np.random.default_rng()
+
+# Keyword lists used by DataProcessor.extract_entities
+_PRODUCT_KEYWORDS = ["laptop", "phone", "tablet", "computer", "printer", "software"]
+_ISSUE_KEYWORDS = ["broken", "error", "not working", "issue", "problem", "bug", "crash"]
+_POSITIVE_WORDS = ["happy", "satisfied", "great", "excellent"]
+_NEGATIVE_WORDS = ["unhappy", "disappointed", "frustrated", "angry"]
+
+# All keyword lists folded into one pattern so the text is scanned once;
+# the named group of each match tells which list it came from
+_ENTITY_RE = re.compile("|".join(
+    f"(?P<{group}>{'|'.join(map(re.escape, keywords))})"
+    for group, keywords in (
+        ("prod", _PRODUCT_KEYWORDS),
+        ("iss", _ISSUE_KEYWORDS),
+        ("pos", _POSITIVE_WORDS),
+        ("neg", _NEGATIVE_WORDS),
+    )
+))
+
+# Sender codes used by DataProcessor.segment_conversation
+_SENDER_CUSTOMER = 0
+_SENDER_AGENT = 1
+_SENDER_OTHER = 2
+_SENDER_CODES = {"customer": _SENDER_CUSTOMER, "agent": _SENDER_AGENT}
+
+@lru_cache(maxsize=4096)
+def _match_entities(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], int, int]:
+    """
+    Scan a text once for all entity keywords
+    
+    Returns:
+        Tuple of (products, issues, positive_count, negative_count); products and
+        issues are in keyword-list order without duplicates
+    """
+    found = {"prod": set(), "iss": set(), "pos": set(), "neg": set()}
+    for match in _ENTITY_RE.finditer(text.lower()):
+        found[match.lastgroup].add(match.group())
+    
+    products = tuple(kw for kw in _PRODUCT_KEYWORDS if kw in found["prod"])
+    issues = tuple(kw for kw in _ISSUE_KEYWORDS if kw in found["iss"])
+    return products, issues, len(found["pos"]), len(found["neg"])
+
+def _conversation_messages(conversation: Union[Dict[str, Any], Iterable[Dict[str, Any]]]) -> Optional[Iterable[Dict[str, Any]]]:
+    """Return the messages of a conversation dict, or the argument itself if it is already an iterable of messages"""
+    if isinstance(conversation, dict):
+        return conversation.get('messages')
+    return conversation
 
 class DataProcessor:
     """Utility for processing and formatting customer support conversations"""
@@ -17,6 +75,9 @@ class DataProcessor:
     def load_conversation(file_path: str) -> Dict[str, Any]:
         """Load conversation from JSON file"""
         try:
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(file_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
@@ -24,28 +85,78 @@ class DataProcessor:
             return {}
     
     @staticmethod
-    def load_historical_data(file_path: str) -> pd.DataFrame:
-        """Load historical support data from CSV file"""
+    def iter_messages(file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the messages of a conversation JSON file one at a time (requires ijson)
+        
+        Useful for very large transcripts: the result can be passed straight to
+        format_conversation_for_summarization or segment_conversation.
+        """
+        import ijson
+        
+        with open(file_path, 'rb') as f:
+            yield from ijson.items(f, 'messages.item')
+    
+    @staticmethod
+    def load_historical_data(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load historical support data from CSV file
+        
+        Uses the multithreaded PyArrow CSV reader when available, and pd.read_csv
+        otherwise; both return the same column types. Pass columns to read only those columns.
+        """
         try:
-            return pd.read_csv(file_path)
+            if pa is not None:
+                try:
+                    read_options = pacsv.ReadOptions(use_threads=True, block_size=1 << 20)
+                    
+                    # pd.read_csv leaves dates and times as strings, so keep any column
+                    # PyArrow would infer as temporal (from the first block) as a string
+                    with pacsv.open_csv(
+                        file_path,
+                        read_options=read_options,
+                        convert_options=pacsv.ConvertOptions(include_columns=columns)
+                    ) as reader:
+                        column_types = {field.name: pa.string() for field in reader.schema
+                                        if pa.types.is_temporal(field.type)}
+                    
+                    table = pacsv.read_csv(
+                        file_path,
+                        read_options=read_options,
+                        convert_options=pacsv.ConvertOptions(
+                            include_columns=columns,
+                            column_types=column_types,
+                            strings_can_be_null=True
+                        )
+                    )
+                    
+                    # Default NumPy-backed dtypes, e.g. NaN for missing numbers and empty
+                    # strings, as pd.read_csv gives
+                    return table.to_pandas()
+                except pa.ArrowInvalid as e:
+                    print(f"PyArrow could not read {file_path}, falling back to pandas: {e}")
+            return pd.read_csv(file_path, usecols=columns)
         except Exception as e:
             print(f"Error loading historical data from {file_path}: {e}")
             return pd.DataFrame()
     
     @staticmethod
-    def format_conversation_for_summarization(conversation: Dict[str, Any]) -> str:
-        """Format conversation for summarization"""
-        formatted_text = ""
+    def format_conversation_for_summarization(conversation: Union[Dict[str, Any], Iterable[Dict[str, Any]]]) -> str:
+        """Format conversation (or an iterable of its messages) for summarization"""
+        # Collect the pieces and join once instead of growing a string in the loop
+        parts = []
+        append = parts.append
         
-        if 'messages' in conversation:
-            for msg in conversation['messages']:
+        messages = _conversation_messages(conversation)
+        if messages is not None:
+            for msg in messages:
                 sender = msg.get('sender', 'Unknown')
                 content = msg.get('content', '')
                 time = msg.get('timestamp', '')
                 
-                formatted_text += f"{sender} ({time}): {content}\n\n"
+                append(f"{sender} ({time}): {content}\n\n")
         
-        return formatted_text
+        return "".join(parts)
     
     @staticmethod
     def extract_entities(text: str) -> Dict[str, Any]:
@@ -59,26 +170,10 @@ class DataProcessor:
             "customer_sentiment": "neutral"
         }
         
-        # Simple keyword matching for demonstration
-        product_keywords = ["laptop", "phone", "tablet", "computer", "printer", "software"]
-        issue_keywords = ["broken", "error", "not working", "issue", "problem", "bug", "crash"]
-        
-        text_lower = text.lower()
-        
-        for product in product_keywords:
-            if product in text_lower:
-                entities["products"].append(product)
-                
-        for issue in issue_keywords:
-            if issue in text_lower:
-                entities["issues"].append(issue)
-        
-        # Basic sentiment analysis
-        positive_words = ["happy", "satisfied", "great", "excellent"]
-        negative_words = ["unhappy", "disappointed", "frustrated", "angry"]
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        # Simple keyword matching for demonstration (memoized on the text)
+        products, issues, positive_count, negative_count = _match_entities(text)
+        entities["products"] = list(products)
+        entities["issues"] = list(issues)
         
         if positive_count > negative_count:
             entities["customer_sentiment"] = "positive"
@@ -95,31 +190,45 @@ class DataProcessor:
         # This would typically involve feature extraction and preprocessing
         # Simplified for demo purposes
         
+        # Pick row positions directly rather than letting DataFrame.sample permute the whole index
+        historical_data_sample = []
+        if not historical_data.empty:
+            idx = _RNG.choice(len(historical_data), size=min(5, len(historical_data)), replace=False)
+            historical_data_sample = historical_data.iloc[idx].to_dict(orient='records')
+        
         return {
             "summary": conversation_summary,
             "actions": extracted_actions,
-            "historical_data_sample": historical_data.sample(5).to_dict() if not historical_data.empty else {}
+            "historical_data_sample": historical_data_sample
         }
     
     @staticmethod
-    def segment_conversation(conversation: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Segment conversation into meaningful parts"""
+    def segment_conversation(conversation: Union[Dict[str, Any], Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Segment conversation (or an iterable of its messages) into meaningful parts"""
         segments = []
         
-        if 'messages' in conversation:
-            current_segment = []
-            for msg in conversation['messages']:
-                current_segment.append(msg)
-                
-                # Segment when customer sends a message after agent response
-                if (len(current_segment) >= 2 and 
-                    current_segment[-1].get('sender') == 'Customer' and
-                    current_segment[-2].get('sender') == 'Agent'):
-                    segments.append(current_segment.copy())
-                    current_segment = [msg]  # Start next segment with this message
+        messages = _conversation_messages(conversation)
+        if messages is not None:
+            # Segments hold every message anyway, so materialize streamed input once
+            if not isinstance(messages, list):
+                messages = list(messages)
+            
+            # Classify every sender once up front so the loop only compares ints
+            senders = [_SENDER_CODES.get(msg.get('sender', '').lower(), _SENDER_OTHER) for msg in messages]
+            
+            # Segment when customer sends a message after agent response; that message
+            # closes the current segment and also starts the next one
+            bounds = []
+            segment_start = 0
+            for i in range(1, len(senders)):
+                if senders[i] == _SENDER_CUSTOMER and senders[i - 1] == _SENDER_AGENT:
+                    bounds.append((segment_start, i + 1))
+                    segment_start = i
             
             # Add any remaining messages as a segment
-            if current_segment:
-                segments.append(current_segment)
+            if messages:
+                bounds.append((segment_start, len(messages)))
+            
+            segments = [messages[start:end] for start, end in bounds]
         
-        return segments 
\ No newline at end of file
+        return segments
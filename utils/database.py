@@ -2,39 +2,367 @@ import sqlite3
 import json
 import os
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
+import numpy as np
+
+if TYPE_CHECKING:
+    from utils.vector_store import VectorStore
+
+try:
+    import faiss
+except ImportError:
+    # Optional; find_similar_embeddings falls back to a NumPy scan
+    faiss = None
+
+try:
+    import numba
+except ImportError:
+    # Optional; the NumPy scan uses a BLAS matrix-vector product instead
+    numba = None
+
+try:
+    import orjson
+except ImportError:
+    # Optional; JSON columns fall back to the stdlib json module
+    orjson = None
+
+# Corpus size above which the FAISS index switches from exact search to HNSW
+_FAISS_HNSW_THRESHOLD = 10_000
+
+# SQL statements, kept as constants so each text is built once and reused from the
+# connection's statement cache (keyed on the SQL text)
+_SQL_INSERT_CONVERSATION = "INSERT OR REPLACE INTO conversations (conversation_id, raw_data, timestamp, metadata) VALUES (?, ?, ?, ?)"
+_SQL_UPDATE_SUMMARY = "UPDATE conversations SET summary = ? WHERE conversation_id = ?"
+_SQL_DELETE_ACTIONS = "DELETE FROM actions WHERE conversation_id = ?"
+_SQL_INSERT_ACTION = "INSERT INTO actions (conversation_id, action, priority, status, timestamp) VALUES (?, ?, ?, ?, ?)"
+_SQL_UPSERT_ROUTING = """
+INSERT INTO routing_decisions (conversation_id, recommended_team, confidence, justification, timestamp) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(conversation_id) DO UPDATE SET
+    recommended_team = excluded.recommended_team, confidence = excluded.confidence,
+    justification = excluded.justification, timestamp = excluded.timestamp
+"""
+_SQL_UPSERT_RECOMMENDATION = """
+INSERT INTO resolution_recommendations (conversation_id, immediate_steps, complete_resolution_path, reasoning, confidence_score, timestamp) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(conversation_id) DO UPDATE SET
+    immediate_steps = excluded.immediate_steps, complete_resolution_path = excluded.complete_resolution_path,
+    reasoning = excluded.reasoning, confidence_score = excluded.confidence_score, timestamp = excluded.timestamp
+"""
+_SQL_UPSERT_PREDICTION = """
+INSERT INTO time_predictions (conversation_id, predicted_category, estimated_hours, confidence_score, factors, timestamp) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(conversation_id) DO UPDATE SET
+    predicted_category = excluded.predicted_category, estimated_hours = excluded.estimated_hours,
+    confidence_score = excluded.confidence_score, factors = excluded.factors, timestamp = excluded.timestamp
+"""
+_SQL_INDEX_EXISTS = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?"
+_SQL_INSERT_EMBEDDING = "INSERT INTO embeddings (source_type, source_id, text, embedding, embedding_model, timestamp, dim) VALUES (?, ?, ?, ?, ?, ?, ?)"
+_SQL_EMBEDDINGS_VERSION = "SELECT max(embedding_id) FROM embeddings"
+_SQL_SELECT_ALL_EMBEDDINGS = "SELECT embedding_id, source_type, source_id, text, embedding FROM embeddings"
+# Embeddings of one dimension with embedding_id in (?, ?], i.e. those stored since a cached scan
+_SQL_SELECT_EMBEDDINGS = "SELECT source_type, source_id, text, embedding FROM embeddings WHERE embedding_id > ? AND embedding_id <= ? AND dim = ?"
+_SQL_COUNT_EMBEDDINGS = "SELECT count(*) FROM embeddings WHERE embedding_id > ? AND embedding_id <= ? AND dim = ?"
+_SQL_SELECT_EMBEDDINGS_BY_SOURCE = _SQL_SELECT_EMBEDDINGS + " AND source_type = ?"
+_SQL_COUNT_EMBEDDINGS_BY_SOURCE = _SQL_COUNT_EMBEDDINGS + " AND source_type = ?"
+_SQL_SELECT_CONVERSATION = "SELECT conversation_id, raw_data, summary, timestamp, metadata FROM conversations WHERE conversation_id = ?"
+_SQL_SELECT_ACTIONS = "SELECT action, priority, status FROM actions WHERE conversation_id = ?"
+# Summary plus the latest routing decision, recommendation and time prediction of a
+# conversation in one row; each *_rn column is NULL when that table has no row, and the
+# JSON list columns are only returned when their section was requested
+_SQL_SELECT_PROCESSING_RESULTS = """
+WITH
+latest_routing AS (
+    SELECT recommended_team, confidence, justification, timestamp,
+           ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY timestamp DESC) AS rn
+    FROM routing_decisions WHERE conversation_id = :conversation_id
+),
+latest_recommendation AS (
+    SELECT immediate_steps, complete_resolution_path, reasoning, confidence_score, timestamp,
+           ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY timestamp DESC) AS rn
+    FROM resolution_recommendations WHERE conversation_id = :conversation_id
+),
+latest_prediction AS (
+    SELECT predicted_category, estimated_hours, confidence_score, factors, timestamp,
+           ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY timestamp DESC) AS rn
+    FROM time_predictions WHERE conversation_id = :conversation_id
+)
+SELECT
+    (SELECT summary FROM conversations WHERE conversation_id = :conversation_id),
+    r.rn, r.recommended_team, r.confidence, r.justification, r.timestamp,
+    rr.rn,
+    CASE WHEN :recommendations THEN rr.immediate_steps END,
+    CASE WHEN :recommendations THEN rr.complete_resolution_path END,
+    rr.reasoning, rr.confidence_score, rr.timestamp,
+    p.rn, p.predicted_category, p.estimated_hours, p.confidence_score,
+    CASE WHEN :time_prediction THEN p.factors END,
+    p.timestamp
+FROM (SELECT 1)
+LEFT JOIN latest_routing r ON r.rn = 1
+LEFT JOIN latest_recommendation rr ON rr.rn = 1
+LEFT JOIN latest_prediction p ON p.rn = 1
+"""
+# Sizes and first entries of the JSON lists of a conversation, computed by SQLite's JSON1
+# functions so the lists are not parsed in Python
+_SQL_SELECT_PROCESSING_OVERVIEW = """
+SELECT
+    (SELECT count(*) FROM actions WHERE conversation_id = :conversation_id),
+    json_array_length(rr.immediate_steps), json_extract(rr.immediate_steps, '$[0]'),
+    json_array_length(rr.complete_resolution_path),
+    json_array_length(p.factors), json_extract(p.factors, '$[0]')
+FROM (SELECT 1)
+LEFT JOIN resolution_recommendations rr ON rr.conversation_id = :conversation_id
+LEFT JOIN time_predictions p ON p.conversation_id = :conversation_id
+"""
+_SQL_INSERT_HISTORICAL = """
+INSERT INTO historical_data 
+(ticket_id, issue_type, assigned_team, status, priority, 
+ resolution_time_hours, resolution_details, customer_satisfaction, created_date)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_SELECT_SIMILAR_HISTORICAL = """
+SELECT * FROM historical_data
+WHERE issue_type = ?
+ORDER BY created_date DESC
+LIMIT ?
+"""
+
+# Widest embedding scored with the Numba kernel; BLAS threads well above this
+_NUMBA_MAX_DIM = 512
+
+# Rows per step when loading embeddings and when widening a float16 matrix (~1.5 MB at 384-d)
+_EMBEDDING_BLOCK_ROWS = 1024
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _ip_scores(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Dot product of every matrix row with the query, with rows spread across cores"""
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in numba.prange(matrix.shape[0]):
+            acc = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+
+# Number of get_conversation/get_processing_results results kept by each Database
+_READ_CACHE_SIZE = 256
+
+# Sections returned by Database.get_processing_results
+_RESULT_FIELDS = ("summary", "actions", "routing", "recommendations", "time_prediction")
+
+# Set up logging once at import, unless the application already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, 
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+def _dumps(value: Any) -> str:
+    """Serialize a value for a JSON column"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(value)
+
+def _loads(value: Union[str, bytes]) -> Any:
+    """Parse a JSON column"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+def _normalize_embedding(embedding: Sequence[float]) -> np.ndarray:
+    """L2-normalize an embedding so that dot products between vectors are cosine similarities"""
+    vector = np.asarray(embedding, dtype=np.float32)
+    return vector / (np.linalg.norm(vector) + 1e-12)
+
+def _encode_embedding(embedding: Sequence[float]) -> Tuple[bytes, int]:
+    """
+    Pack an embedding vector into raw float32 bytes, normalized to unit length
+    
+    Returns:
+        Tuple of (blob, dimension)
+    """
+    vector = _normalize_embedding(embedding)
+    return vector.tobytes(), vector.size
 
 class Database:
     """SQLite database interface for storing customer support data"""
     
-    def __init__(self, db_path: str = "customer_support.db"):
+    def __init__(self, db_path: str = "customer_support.db", half_precision_embeddings: bool = False,
+                 vector_store: Optional["VectorStore"] = None):
         """
         Initialize the database interface
         
         Args:
             db_path: Path to the SQLite database file
+            half_precision_embeddings: Keep the in-memory embedding matrices as float16,
+                halving their memory at a small cost in similarity precision
+            vector_store: Optional external index (e.g. ChromaVectorStore) that mirrors stored
+                embeddings and serves find_similar_embeddings; see sync_vector_store
         """
         self.db_path = db_path
+        self.half_precision_embeddings = half_precision_embeddings
+        self.vector_store = vector_store
         
         # Set up logging
-        logging.basicConfig(level=logging.INFO, 
-                           format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger("Database")
         
+        # One long-lived connection per thread, tracked so close() can release them all
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        
+        # Recent read results by key as (version, result), and a version per conversation
+        # bumped by every write to it so stale entries are never returned
+        self._read_cache: "OrderedDict[Tuple[Any, ...], Tuple[int, Any]]" = OrderedDict()
+        self._read_versions: Dict[str, int] = {}
+        self._read_cache_lock = threading.Lock()
+        
+        # Embedding matrices by (source_type, dim) as (max embedding_id loaded, buffer,
+        # source_types, source_ids, texts); the first len(source_ids) buffer rows are filled
+        # and newer embeddings are appended to the spare rows
+        self._embedding_matrices: Dict[Tuple[Optional[str], int], Tuple[int, np.ndarray, List[str], List[str], List[str]]] = {}
+        self._embedding_matrices_lock = threading.Lock()
+        
+        # FAISS indexes by (source_type, dim), with the source_ids list of the scan they
+        # index; the lock also covers searches, since FAISS indexes are not safe to search
+        # while rows are added
+        self._faiss_indexes: Dict[Tuple[Optional[str], int], Tuple[List[str], Any]] = {}
+        self._faiss_lock = threading.Lock()
+        
         # Create tables if they don't exist
         self._initialize_database()
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a connection to the SQLite database"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's connection to the SQLite database, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            
+            # WAL lets readers run alongside the writer and makes synchronous=NORMAL crash-safe
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")
+            
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        elif conn.in_transaction and not getattr(self._local, "batch_depth", 0):
+            # Never let a write that failed without rolling back be committed by the next one
+            self.logger.warning("Discarding uncommitted changes left on the database connection")
+            conn.rollback()
+        return conn
+    
+    def close(self) -> None:
+        """Close every connection opened by this instance"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._local = threading.local()
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group several writes on this thread into a single transaction
+        
+        store_* calls inside the block skip their own commit; everything is committed
+        once when the outermost block exits, or rolled back if it raises. A failed
+        write inside the block rolls back the whole batch.
+        """
+        conn = self._get_connection()
+        depth = getattr(self._local, "batch_depth", 0)
+        self._local.batch_depth = depth + 1
+        try:
+            yield
+            if depth == 0:
+                conn.commit()
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+                # Results read inside the batch may include the rolled back writes
+                with self._read_cache_lock:
+                    self._read_cache.clear()
+            raise
+        finally:
+            self._local.batch_depth = depth
+            if depth == 0:
+                self._local.batch_now = None
+    
+    def _now_iso(self) -> str:
+        """Current time as an ISO string, computed once per batch() so grouped writes share it"""
+        if not getattr(self._local, "batch_depth", 0):
+            return datetime.now().isoformat()
+        now = getattr(self._local, "batch_now", None)
+        if now is None:
+            now = self._local.batch_now = datetime.now().isoformat()
+        return now
+    
+    def _commit(self, conn: sqlite3.Connection) -> None:
+        """Commit a write, unless it is part of a batch() that commits on exit"""
+        if not getattr(self._local, "batch_depth", 0):
+            conn.commit()
+    
+    @contextmanager
+    def _txn(self, action: str) -> Iterator[sqlite3.Cursor]:
+        """
+        Run a write on this thread's connection
+        
+        Yields a cursor; the write is committed when the block exits, or rolled back,
+        logged and re-raised on any error. Inside batch() both are left to the batch.
+        
+        Args:
+            action: What the write does, for the error log (e.g. "storing actions")
+        """
+        conn = self._get_connection()
+        try:
+            yield conn.cursor()
+            self._commit(conn)
+        except BaseException as e:
+            # Otherwise the next write on this connection would commit the partial write
+            if not getattr(self._local, "batch_depth", 0):
+                conn.rollback()
+            self.logger.error(f"Error {action}: {e}")
+            raise
+    
+    def _cached_read(self, key: Tuple[Any, ...], conversation_id: str) -> Tuple[int, bool, Any]:
+        """
+        Look up a cached read result
+        
+        Returns:
+            Tuple of (version, hit, result); pass the version to _cache_read when storing
+            a fresh result so that a write made in the meantime invalidates it
+        """
+        with self._read_cache_lock:
+            version = self._read_versions.get(conversation_id, 0)
+            entry = self._read_cache.get(key)
+            if entry is not None and entry[0] == version:
+                self._read_cache.move_to_end(key)
+                return version, True, entry[1]
+        return version, False, None
+    
+    def _cache_read(self, key: Tuple[Any, ...], version: int, result: Any) -> None:
+        """Store a read result, evicting the least recently used one when the cache is full"""
+        with self._read_cache_lock:
+            self._read_cache[key] = (version, result)
+            self._read_cache.move_to_end(key)
+            if len(self._read_cache) > _READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+    
+    def _invalidate_reads(self, conversation_id: str) -> None:
+        """Mark cached reads of a conversation as stale after a write"""
+        with self._read_cache_lock:
+            self._read_versions[conversation_id] = self._read_versions.get(conversation_id, 0) + 1
+    
+    def __enter__(self) -> "Database":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def _initialize_database(self) -> None:
         """Create the necessary tables if they don't exist"""
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
+        with self._txn("initializing database") as cursor:
             # Create conversations table
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS conversations (
@@ -123,53 +451,83 @@ class Database:
                 source_type TEXT,  -- conversations, historical_data, etc.
                 source_id TEXT,    -- conversation_id, record_id, etc.
                 text TEXT,         -- The text that was embedded
-                embedding BLOB,    -- The serialized embedding vector
+                embedding BLOB,    -- The embedding vector as raw float32 bytes
                 embedding_model TEXT,
-                timestamp TEXT
+                timestamp TEXT,
+                dim INTEGER        -- Number of components in the embedding
             )
             ''')
             
-            conn.commit()
-            self.logger.info("Database tables initialized successfully")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Database initialization error: {e}")
-            raise
-        finally:
-            conn.close()
+            # Routing decisions, recommendations and time predictions hold one row per
+            # conversation, enforced by a unique index that the store_* upserts conflict on;
+            # databases created before the index existed keep only their latest row
+            for table in ("routing_decisions", "resolution_recommendations", "time_predictions"):
+                index = f"idx_{table}_conv"
+                if not cursor.execute(_SQL_INDEX_EXISTS, (index,)).fetchone():
+                    cursor.execute(f"""
+                    DELETE FROM {table} WHERE rowid NOT IN (
+                        SELECT rowid FROM (
+                            SELECT rowid, ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY timestamp DESC) AS rn
+                            FROM {table}
+                        ) WHERE rn = 1
+                    )
+                    """)
+                    cursor.execute(f"CREATE UNIQUE INDEX {index} ON {table}(conversation_id)")
+            
+            # Index the other columns that the store_* deletes and the lookups filter on
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_actions_conv ON actions(conversation_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_historical_issue_type ON historical_data(issue_type, created_date DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_src ON embeddings(source_type, source_id)")
+            
+            # Upgrade embeddings tables created by older versions, which stored vectors as JSON
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(embeddings)")}
+            if "dim" not in columns:
+                cursor.execute("ALTER TABLE embeddings ADD COLUMN dim INTEGER")
+            legacy_rows = cursor.execute(
+                "SELECT embedding_id, embedding FROM embeddings WHERE typeof(embedding) = 'text'"
+            ).fetchall()
+            cursor.executemany(
+                "UPDATE embeddings SET embedding = ?, dim = ? WHERE embedding_id = ?",
+                [(*_encode_embedding(_loads(value)), embedding_id) for embedding_id, value in legacy_rows]
+            )
+        
+        self.logger.info("Database tables initialized successfully")
     
-    def store_conversation(self, conversation: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+    def store_conversation(self, conversation: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None, timestamp: Optional[str] = None,
+                           raw_data_bytes: Optional[Union[bytes, str]] = None) -> None:
         """
         Store a conversation in the database
         
         Args:
             conversation: The conversation to store
             metadata: Optional metadata about the conversation
+            timestamp: Optional ISO timestamp to record; defaults to the current time
+            raw_data_bytes: Optional original JSON payload the conversation was parsed from;
+                stored as-is instead of serializing the conversation again
         """
-        try:
+        with self._txn("storing conversation") as cursor:
             conversation_id = conversation.get("conversation_id", str(datetime.now().timestamp()))
             
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            # Reuse the caller's original payload when there is one
+            if raw_data_bytes is None:
+                raw_data = _dumps(conversation)
+            elif isinstance(raw_data_bytes, bytes):
+                raw_data = raw_data_bytes.decode("utf-8")
+            else:
+                raw_data = raw_data_bytes
             
             cursor.execute(
-                "INSERT OR REPLACE INTO conversations (conversation_id, raw_data, timestamp, metadata) VALUES (?, ?, ?, ?)",
+                _SQL_INSERT_CONVERSATION,
                 (
                     conversation_id,
-                    json.dumps(conversation),
-                    datetime.now().isoformat(),
-                    json.dumps(metadata) if metadata else "{}"
+                    raw_data,
+                    timestamp or self._now_iso(),
+                    _dumps(metadata) if metadata else "{}"
                 )
             )
-            
-            conn.commit()
-            self.logger.info(f"Stored conversation {conversation_id}")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error storing conversation: {e}")
-            raise
-        finally:
-            conn.close()
+        
+        self._invalidate_reads(conversation_id)
+        self.logger.info("Stored conversation %s", conversation_id)
     
     def update_conversation_summary(self, conversation_id: str, summary: str) -> None:
         """
@@ -179,173 +537,124 @@ class Database:
             conversation_id: The ID of the conversation
             summary: The summary to store
         """
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
+        with self._txn("updating conversation summary") as cursor:
             cursor.execute(
-                "UPDATE conversations SET summary = ? WHERE conversation_id = ?",
+                _SQL_UPDATE_SUMMARY,
                 (summary, conversation_id)
             )
-            
-            conn.commit()
-            self.logger.info(f"Updated summary for conversation {conversation_id}")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error updating conversation summary: {e}")
-            raise
-        finally:
-            conn.close()
+        
+        self._invalidate_reads(conversation_id)
+        self.logger.info("Updated summary for conversation %s", conversation_id)
     
-    def store_actions(self, conversation_id: str, actions: Dict[str, Any]) -> None:
+    def store_actions(self, conversation_id: str, actions: Dict[str, Any], timestamp: Optional[str] = None) -> None:
         """
         Store extracted actions for a conversation
         
         Args:
             conversation_id: The ID of the conversation
             actions: The extracted actions
+            timestamp: Optional ISO timestamp to record; defaults to the current time
         """
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
+        with self._txn("storing actions") as cursor:
             # First, delete any existing actions for this conversation
-            cursor.execute("DELETE FROM actions WHERE conversation_id = ?", (conversation_id,))
+            cursor.execute(_SQL_DELETE_ACTIONS, (conversation_id,))
             
-            # Insert new actions
+            # Insert new actions, all stamped with the same time
             if "action_items" in actions:
+                timestamp = timestamp or self._now_iso()
                 for action_item in actions["action_items"]:
                     cursor.execute(
-                        "INSERT INTO actions (conversation_id, action, priority, status, timestamp) VALUES (?, ?, ?, ?, ?)",
+                        _SQL_INSERT_ACTION,
                         (
                             conversation_id,
                             action_item.get("action", ""),
                             action_item.get("priority", "Medium"),
                             action_item.get("status", "Pending"),
-                            datetime.now().isoformat()
+                            timestamp
                         )
                     )
-            
-            conn.commit()
-            self.logger.info(f"Stored actions for conversation {conversation_id}")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error storing actions: {e}")
-            raise
-        finally:
-            conn.close()
+        
+        self._invalidate_reads(conversation_id)
+        self.logger.info("Stored actions for conversation %s", conversation_id)
     
-    def store_routing_decision(self, conversation_id: str, routing: Dict[str, Any]) -> None:
+    def store_routing_decision(self, conversation_id: str, routing: Dict[str, Any], timestamp: Optional[str] = None) -> None:
         """
         Store routing decision for a conversation
         
         Args:
             conversation_id: The ID of the conversation
             routing: The routing decision
+            timestamp: Optional ISO timestamp to record when routing has none; defaults to the current time
         """
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # First, delete any existing routing decisions for this conversation
-            cursor.execute("DELETE FROM routing_decisions WHERE conversation_id = ?", (conversation_id,))
-            
-            # Insert new routing decision
+        with self._txn("storing routing decision") as cursor:
+            # Insert the routing decision, replacing any existing one for this conversation
             cursor.execute(
-                "INSERT INTO routing_decisions (conversation_id, recommended_team, confidence, justification, timestamp) VALUES (?, ?, ?, ?, ?)",
+                _SQL_UPSERT_ROUTING,
                 (
                     conversation_id,
                     routing.get("recommended_team", "Unknown"),
                     routing.get("confidence", "Medium"),
                     routing.get("justification", ""),
-                    routing.get("timestamp", datetime.now().isoformat())
+                    routing["timestamp"] if "timestamp" in routing else timestamp or self._now_iso()
                 )
             )
-            
-            conn.commit()
-            self.logger.info(f"Stored routing decision for conversation {conversation_id}")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error storing routing decision: {e}")
-            raise
-        finally:
-            conn.close()
+        
+        self._invalidate_reads(conversation_id)
+        self.logger.info("Stored routing decision for conversation %s", conversation_id)
     
-    def store_resolution_recommendation(self, conversation_id: str, recommendation: Dict[str, Any]) -> None:
+    def store_resolution_recommendation(self, conversation_id: str, recommendation: Dict[str, Any], timestamp: Optional[str] = None) -> None:
         """
         Store resolution recommendation for a conversation
         
         Args:
             conversation_id: The ID of the conversation
             recommendation: The resolution recommendation
+            timestamp: Optional ISO timestamp to record when recommendation has none; defaults to the current time
         """
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # First, delete any existing recommendations for this conversation
-            cursor.execute("DELETE FROM resolution_recommendations WHERE conversation_id = ?", (conversation_id,))
-            
-            # Insert new recommendation
+        with self._txn("storing resolution recommendation") as cursor:
+            # Insert the recommendation, replacing any existing one for this conversation
             cursor.execute(
-                "INSERT INTO resolution_recommendations (conversation_id, immediate_steps, complete_resolution_path, reasoning, confidence_score, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                _SQL_UPSERT_RECOMMENDATION,
                 (
                     conversation_id,
-                    json.dumps(recommendation.get("immediate_steps", [])),
-                    json.dumps(recommendation.get("complete_resolution_path", [])),
+                    _dumps(recommendation.get("immediate_steps", [])),
+                    _dumps(recommendation.get("complete_resolution_path", [])),
                     recommendation.get("reasoning", ""),
                     recommendation.get("confidence_score", 0.0),
-                    recommendation.get("timestamp", datetime.now().isoformat())
+                    recommendation["timestamp"] if "timestamp" in recommendation else timestamp or self._now_iso()
                 )
             )
-            
-            conn.commit()
-            self.logger.info(f"Stored resolution recommendation for conversation {conversation_id}")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error storing resolution recommendation: {e}")
-            raise
-        finally:
-            conn.close()
+        
+        self._invalidate_reads(conversation_id)
+        self.logger.info("Stored resolution recommendation for conversation %s", conversation_id)
     
-    def store_time_prediction(self, conversation_id: str, prediction: Dict[str, Any]) -> None:
+    def store_time_prediction(self, conversation_id: str, prediction: Dict[str, Any], timestamp: Optional[str] = None) -> None:
         """
         Store time prediction for a conversation
         
         Args:
             conversation_id: The ID of the conversation
             prediction: The time prediction
+            timestamp: Optional ISO timestamp to record when prediction has none; defaults to the current time
         """
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # First, delete any existing predictions for this conversation
-            cursor.execute("DELETE FROM time_predictions WHERE conversation_id = ?", (conversation_id,))
-            
-            # Insert new prediction
+        with self._txn("storing time prediction") as cursor:
+            # Insert the prediction, replacing any existing one for this conversation
             cursor.execute(
-                "INSERT INTO time_predictions (conversation_id, predicted_category, estimated_hours, confidence_score, factors, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                _SQL_UPSERT_PREDICTION,
                 (
                     conversation_id,
                     prediction.get("predicted_category", "unknown"),
                     prediction.get("estimated_hours", 0),
                     prediction.get("confidence_score", 0.0),
-                    json.dumps(prediction.get("factors", [])),
-                    prediction.get("timestamp", datetime.now().isoformat())
+                    _dumps(prediction.get("factors", [])),
+                    prediction["timestamp"] if "timestamp" in prediction else timestamp or self._now_iso()
                 )
             )
-            
-            conn.commit()
-            self.logger.info(f"Stored time prediction for conversation {conversation_id}")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error storing time prediction: {e}")
-            raise
-        finally:
-            conn.close()
+        
+        self._invalidate_reads(conversation_id)
+        self.logger.info("Stored time prediction for conversation %s", conversation_id)
     
-    def store_embedding(self, source_type: str, source_id: str, text: str, embedding: List[float], model: str) -> None:
+    def store_embedding(self, source_type: str, source_id: str, text: str, embedding: List[float], model: str, timestamp: Optional[str] = None) -> None:
         """
         Store an embedding vector in the database
         
@@ -355,35 +664,35 @@ class Database:
             text: The text that was embedded
             embedding: The embedding vector
             model: The embedding model used
+            timestamp: Optional ISO timestamp to record; defaults to the current time
         """
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
+        with self._txn("storing embedding") as cursor:
+            vector = _normalize_embedding(embedding)
             cursor.execute(
-                "INSERT INTO embeddings (source_type, source_id, text, embedding, embedding_model, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                _SQL_INSERT_EMBEDDING,
                 (
                     source_type,
                     source_id,
                     text,
-                    json.dumps(embedding),  # Store as JSON string
+                    vector.tobytes(),  # Store as raw float32 bytes
                     model,
-                    datetime.now().isoformat()
+                    timestamp or self._now_iso(),
+                    vector.size
                 )
             )
-            
-            conn.commit()
-            self.logger.info(f"Stored embedding for {source_type} {source_id}")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error storing embedding: {e}")
-            raise
-        finally:
-            conn.close()
+        
+        # Mirror the embedding into the external index; this is not part of the SQLite transaction
+        if self.vector_store is not None:
+            self.vector_store.add(cursor.lastrowid, source_type, source_id, text, vector)
+        self.logger.info("Stored embedding for %s %s", source_type, source_id)
     
     def find_similar_embeddings(self, embedding: List[float], source_type: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
         """
-        Find similar embeddings using dot product similarity
+        Find similar embeddings using cosine similarity
+        
+        Stored embeddings are normalized when they are written, so only the query is
+        normalized here and the similarity is a plain dot product. Only stored
+        embeddings with the same dimension as the query are compared.
         
         Args:
             embedding: The query embedding vector
@@ -393,63 +702,221 @@ class Database:
         Returns:
             List of similar items with similarity scores
         """
+        conn = self._get_connection()
+        
         try:
-            conn = self._get_connection()
-            conn.create_function("dot_product", 2, self._dot_product)
-            cursor = conn.cursor()
             
-            query = """
-            SELECT source_type, source_id, text, dot_product(embedding, ?) as similarity
-            FROM embeddings
-            """
-            params = [json.dumps(embedding)]
+            query_vector = _normalize_embedding(embedding)
+            if self.vector_store is not None:
+                return self.vector_store.search(query_vector, source_type, limit)
+            
+            source_types, source_ids, texts, matrix = self._scan_embeddings_matrix(conn, source_type, query_vector.size)
+            
+            limit = min(limit, len(matrix))
+            if limit <= 0:
+                return []
+            
+            if faiss is not None:
+                # Search the FAISS index built over the same matrix
+                with self._faiss_lock:
+                    index = self._faiss_index((source_type, query_vector.size), source_ids, matrix)
+                    distances, indices = index.search(query_vector[None, :], limit)
+                hits = [(i, d) for i, d in zip(indices[0], distances[0]) if i >= 0]
+            else:
+                # Score the whole corpus in one pass and select the top k
+                scores = self._score_matrix(matrix, query_vector)
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                top = top[np.argsort(-scores[top], kind="stable")]
+                hits = [(i, scores[i]) for i in top]
+            
+            return [
+                {
+                    "source_type": source_types[i],
+                    "source_id": source_ids[i],
+                    "text": texts[i],
+                    "similarity": float(score)
+                }
+                for i, score in hits
+            ]
             
-            if source_type:
-                query += " WHERE source_type = ?"
-                params.append(source_type)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error finding similar embeddings: {e}")
+            return []
+    
+    def sync_vector_store(self) -> int:
+        """
+        Copy every stored embedding into the configured vector store
+        
+        Use this once after attaching a new vector store to an existing database.
+        
+        Returns:
+            Number of embeddings copied
+        """
+        if self.vector_store is None:
+            return 0
+        
+        conn = self._get_connection()
+        
+        try:
+            count = 0
+            for embedding_id, source_type, source_id, text, blob in conn.execute(_SQL_SELECT_ALL_EMBEDDINGS):
+                self.vector_store.add(embedding_id, source_type, source_id, text, np.frombuffer(blob, dtype=np.float32))
+                count += 1
             
-            query += " ORDER BY similarity DESC LIMIT ?"
-            params.append(limit)
+            self.logger.info("Copied %s embeddings to the vector store", count)
+            return count
             
-            cursor.execute(query, params)
-            results = cursor.fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error syncing vector store: {e}")
+            raise
+    
+    def _score_matrix(self, matrix: np.ndarray, query_vector: np.ndarray) -> np.ndarray:
+        """
+        Compute the dot product of every matrix row with the query vector
+        
+        Args:
+            matrix: Embedding matrix, float32 or float16
+            query_vector: Query embedding vector as float32
             
-            similar_items = []
-            for source_type, source_id, text, similarity in results:
-                similar_items.append({
-                    "source_type": source_type,
-                    "source_id": source_id,
-                    "text": text,
-                    "similarity": similarity
-                })
+        Returns:
+            float32 array of scores, one per matrix row
+        """
+        if matrix.dtype == np.float16:
+            # Widen one cache-sized block at a time rather than copying the whole matrix
+            scores = np.empty(len(matrix), dtype=np.float32)
+            for start in range(0, len(matrix), _EMBEDDING_BLOCK_ROWS):
+                block = matrix[start:start + _EMBEDDING_BLOCK_ROWS]
+                scores[start:start + len(block)] = block.astype(np.float32) @ query_vector
+            return scores
+        
+        # With several cores, short vectors use the parallel Numba kernel since BLAS runs them on one thread
+        if numba is not None and query_vector.size <= _NUMBA_MAX_DIM and numba.get_num_threads() > 1:
+            return _ip_scores(matrix, query_vector)
+        return matrix @ query_vector
+    
+    def _scan_embeddings_matrix(self, conn: sqlite3.Connection, source_type: Optional[str], dim: int) -> Tuple[List[str], List[str], List[str], np.ndarray]:
+        """
+        Load the stored embeddings of one dimension into a contiguous matrix
+        
+        The result is cached; embeddings stored since the previous call are appended to
+        it, so only the new rows are read and decoded.
+        
+        Args:
+            conn: Open database connection
+            source_type: Optional filter for source type
+            dim: Dimension of the embeddings to load
             
-            return similar_items
+        Returns:
+            Tuple of (source_types, source_ids, texts, matrix) with one matrix row per embedding
+        """
+        version = conn.execute(_SQL_EMBEDDINGS_VERSION).fetchone()[0] or 0
+        key = (source_type, dim)
+        
+        with self._embedding_matrices_lock:
+            cached = self._embedding_matrices.get(key)
+            if cached is not None and cached[0] == version:
+                _, buffer, source_types, source_ids, texts = cached
+            else:
+                if cached is None or version < cached[0]:
+                    # First scan, or the newest rows were removed: load everything
+                    dtype = np.float16 if self.half_precision_embeddings else np.float32
+                    cached = (0, np.empty((0, dim), dtype=dtype), [], [], [])
+                
+                loaded, buffer, source_types, source_ids, texts = cached
+                buffer = self._append_embedding_rows(conn, source_type, dim, loaded, version, buffer, source_types, source_ids, texts)
+                self._embedding_matrices[key] = (version, buffer, source_types, source_ids, texts)
+            
+            # The lists may grow after this returns; the matrix view marks the rows in this scan
+            return source_types, source_ids, texts, buffer[:len(source_ids)]
+    
+    def _append_embedding_rows(self, conn: sqlite3.Connection, source_type: Optional[str], dim: int,
+                               after: int, until: int, buffer: np.ndarray,
+                               source_types: List[str], source_ids: List[str], texts: List[str]) -> np.ndarray:
+        """
+        Append the embeddings with after < embedding_id <= until to a cached scan
+        
+        Args:
+            conn: Open database connection
+            source_type: Optional filter for source type
+            dim: Dimension of the embeddings to load
+            after: Largest embedding_id already in the scan
+            until: Largest embedding_id to load
+            buffer: Matrix whose first len(source_ids) rows are filled
+            source_types: Source types of the filled rows, extended in place
+            source_ids: Source IDs of the filled rows, extended in place
+            texts: Texts of the filled rows, extended in place
             
-        except sqlite3.Error as e:
-            self.logger.error(f"Error finding similar embeddings: {e}")
-            return []
-        finally:
-            conn.close()
+        Returns:
+            The buffer holding every row, reallocated if the new rows did not fit
+        """
+        if source_type:
+            select, count, params = _SQL_SELECT_EMBEDDINGS_BY_SOURCE, _SQL_COUNT_EMBEDDINGS_BY_SOURCE, (after, until, dim, source_type)
+        else:
+            select, count, params = _SQL_SELECT_EMBEDDINGS, _SQL_COUNT_EMBEDDINGS, (after, until, dim)
+        
+        filled = len(source_ids)
+        total = filled + conn.execute(count, params).fetchone()[0]
+        
+        # Grow geometrically so that appending one row at a time stays amortized O(1)
+        if total > len(buffer):
+            grown = np.empty((max(total, 2 * len(buffer)), dim), dtype=buffer.dtype)
+            grown[:filled] = buffer[:filled]
+            buffer = grown
+        
+        # source_type has a handful of distinct values; share one string object per value
+        # instead of holding a separate copy for every cached row
+        interned = {source_types[-1]: source_types[-1]} if source_types else {}
+        
+        # Stream rows into the buffer a block at a time, so peak memory is the matrix
+        # plus one block rather than every row and blob fetched at once
+        cursor = conn.execute(select, params)
+        while filled < total:
+            rows = cursor.fetchmany(min(_EMBEDDING_BLOCK_ROWS, total - filled))
+            if not rows:
+                break
+            buffer[filled:filled + len(rows)] = np.frombuffer(
+                b"".join(row[3] for row in rows), dtype=np.float32
+            ).reshape(len(rows), dim)
+            source_types.extend(interned.setdefault(row[0], row[0]) for row in rows)
+            source_ids.extend(row[1] for row in rows)
+            texts.extend(row[2] for row in rows)
+            filled += len(rows)
+        
+        return buffer
     
-    def _dot_product(self, embedding1_json: str, embedding2_json: str) -> float:
+    def _faiss_index(self, key: Tuple[Optional[str], int], source_ids: List[str], matrix: np.ndarray) -> Any:
         """
-        Calculate dot product between two embedding vectors stored as JSON strings
+        Get an inner-product FAISS index over an embedding matrix, building it on first use
+        
+        Rows appended to the scan since the index was built are added to it; the index is
+        only rebuilt when the scan was reloaded, or to switch a corpus that outgrew exact
+        search to an approximate HNSW index. Call with _faiss_lock held.
         
         Args:
-            embedding1_json: First embedding vector as JSON string
-            embedding2_json: Second embedding vector as JSON string
+            key: (source_type, dim) the matrix was loaded for
+            source_ids: Source IDs list of the scan, which identifies it across appends
+            matrix: Embedding matrix to index
             
         Returns:
-            Dot product similarity
+            FAISS index whose ids are the matrix row numbers
         """
-        embedding1 = json.loads(embedding1_json)
-        embedding2 = json.loads(embedding2_json)
+        count, dim = matrix.shape
+        cached = self._faiss_indexes.get(key)
+        if cached is not None and cached[0] is source_ids and cached[1].ntotal <= count:
+            index = cached[1]
+            if count <= _FAISS_HNSW_THRESHOLD or isinstance(index, faiss.IndexHNSWFlat):
+                if index.ntotal < count:
+                    index.add(np.ascontiguousarray(matrix[index.ntotal:], dtype=np.float32))
+                return index
         
-        # Calculate dot product
-        if len(embedding1) != len(embedding2):
-            return 0.0
+        if count > _FAISS_HNSW_THRESHOLD:
+            index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexFlatIP(dim)
+        index.add(np.ascontiguousarray(matrix, dtype=np.float32))
         
-        return sum(a * b for a, b in zip(embedding1, embedding2))
+        self._faiss_indexes[key] = (source_ids, index)
+        return index
     
     def import_historical_data(self, historical_data: List[Dict[str, Any]]) -> None:
         """
@@ -458,39 +925,28 @@ class Database:
         Args:
             historical_data: List of historical support records
         """
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            for record in historical_data:
-                cursor.execute(
-                    """
-                    INSERT INTO historical_data 
-                    (ticket_id, issue_type, assigned_team, status, priority, 
-                     resolution_time_hours, resolution_details, customer_satisfaction, created_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        record.get("ticket_id", ""),
-                        record.get("issue_type", ""),
-                        record.get("assigned_team", ""),
-                        record.get("status", ""),
-                        record.get("priority", ""),
-                        record.get("resolution_time_hours", 0),
-                        record.get("resolution_details", ""),
-                        record.get("customer_satisfaction", 0),
-                        record.get("created_date", datetime.now().isoformat())
-                    )
+        with self._txn("importing historical data") as cursor:
+            # Records without a created_date all get the same import time
+            now = self._now_iso()
+            rows = (
+                (
+                    record.get("ticket_id", ""),
+                    record.get("issue_type", ""),
+                    record.get("assigned_team", ""),
+                    record.get("status", ""),
+                    record.get("priority", ""),
+                    record.get("resolution_time_hours", 0),
+                    record.get("resolution_details", ""),
+                    record.get("customer_satisfaction", 0),
+                    record.get("created_date", now)
                 )
+                for record in historical_data
+            )
             
-            conn.commit()
-            self.logger.info(f"Imported {len(historical_data)} historical data records")
-            
-        except sqlite3.Error as e:
-            self.logger.error(f"Error importing historical data: {e}")
-            raise
-        finally:
-            conn.close()
+            # Insert all records with one executemany call in a single transaction
+            cursor.executemany(_SQL_INSERT_HISTORICAL, rows)
+        
+        self.logger.info("Imported %s historical data records", len(historical_data))
     
     def get_similar_historical_issues(self, issue_type: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -503,17 +959,13 @@ class Database:
         Returns:
             List of similar historical records
         """
+        conn = self._get_connection()
+        
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
             
             cursor.execute(
-                """
-                SELECT * FROM historical_data
-                WHERE issue_type = ?
-                ORDER BY created_date DESC
-                LIMIT ?
-                """,
+                _SQL_SELECT_SIMILAR_HISTORICAL,
                 (issue_type, limit)
             )
             
@@ -529,8 +981,6 @@ class Database:
         except sqlite3.Error as e:
             self.logger.error(f"Error getting similar historical issues: {e}")
             return []
-        finally:
-            conn.close()
     
     def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -540,48 +990,66 @@ class Database:
             conversation_id: The ID of the conversation to retrieve
             
         Returns:
-            The conversation or None if not found
+            The conversation or None if not found. Results are cached until the
+            conversation is written again through this instance, so treat them as read-only
         """
+        key = ("conversation", conversation_id)
+        version, hit, cached = self._cached_read(key, conversation_id)
+        if hit:
+            return cached
+        
+        conn = self._get_connection()
+        
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
             
             cursor.execute(
-                "SELECT conversation_id, raw_data, summary, timestamp, metadata FROM conversations WHERE conversation_id = ?",
+                _SQL_SELECT_CONVERSATION,
                 (conversation_id,)
             )
             
             result = cursor.fetchone()
             if not result:
+                self._cache_read(key, version, None)
                 return None
             
             conversation_id, raw_data, summary, timestamp, metadata = result
             
-            return {
+            conversation = {
                 "conversation_id": conversation_id,
-                "conversation": json.loads(raw_data),
+                "conversation": _loads(raw_data),
                 "summary": summary,
                 "timestamp": timestamp,
-                "metadata": json.loads(metadata)
+                "metadata": _loads(metadata)
             }
+            self._cache_read(key, version, conversation)
+            return conversation
             
         except sqlite3.Error as e:
             self.logger.error(f"Error getting conversation: {e}")
             return None
-        finally:
-            conn.close()
     
-    def get_processing_results(self, conversation_id: str) -> Dict[str, Any]:
+    def get_processing_results(self, conversation_id: str, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Get all processing results for a conversation
         
         Args:
             conversation_id: The ID of the conversation
+            fields: Optional sections to return, out of "summary", "actions", "routing",
+                "recommendations" and "time_prediction"; defaults to all of them. JSON
+                columns of sections that are not requested are neither fetched nor parsed
             
         Returns:
-            Dictionary with all processing results
+            Dictionary with the requested processing results. Results are cached until the
+            conversation is written again through this instance, so treat them as read-only
         """
-        results = {
+        wanted = set(_RESULT_FIELDS if fields is None else fields)
+        key = ("processing_results", conversation_id, tuple(sorted(wanted)))
+        version, hit, cached = self._cached_read(key, conversation_id)
+        if hit:
+            return cached
+        
+        defaults = {
             "conversation_id": conversation_id,
             "summary": None,
             "actions": {"action_items": []},
@@ -589,86 +1057,116 @@ class Database:
             "recommendations": {},
             "time_prediction": {}
         }
+        results = {key: value for key, value in defaults.items() if key == "conversation_id" or key in wanted}
+        
+        conn = self._get_connection()
         
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
             
-            # Get conversation summary
-            cursor.execute(
-                "SELECT summary FROM conversations WHERE conversation_id = ?",
-                (conversation_id,)
-            )
-            result = cursor.fetchone()
-            if result:
-                results["summary"] = result[0]
+            # Get the summary and the latest routing, recommendation and prediction in one query
+            if wanted & {"summary", "routing", "recommendations", "time_prediction"}:
+                cursor.execute(_SQL_SELECT_PROCESSING_RESULTS, {
+                    "conversation_id": conversation_id,
+                    "recommendations": "recommendations" in wanted,
+                    "time_prediction": "time_prediction" in wanted
+                })
+                (summary,
+                 routing_rn, team, routing_confidence, justification, routing_timestamp,
+                 recommendation_rn, immediate_steps, complete_path, reasoning, recommendation_confidence, recommendation_timestamp,
+                 prediction_rn, category, hours, prediction_confidence, factors, prediction_timestamp) = cursor.fetchone()
+                
+                if "summary" in wanted:
+                    results["summary"] = summary
+                
+                if "routing" in wanted and routing_rn is not None:
+                    results["routing"] = {
+                        "recommended_team": team,
+                        "confidence": routing_confidence,
+                        "justification": justification,
+                        "timestamp": routing_timestamp
+                    }
+                
+                if "recommendations" in wanted and recommendation_rn is not None:
+                    results["recommendations"] = {
+                        "immediate_steps": _loads(immediate_steps),
+                        "complete_resolution_path": _loads(complete_path),
+                        "reasoning": reasoning,
+                        "confidence_score": recommendation_confidence,
+                        "timestamp": recommendation_timestamp
+                    }
+                
+                if "time_prediction" in wanted and prediction_rn is not None:
+                    results["time_prediction"] = {
+                        "predicted_category": category,
+                        "estimated_hours": hours,
+                        "confidence_score": prediction_confidence,
+                        "factors": _loads(factors),
+                        "timestamp": prediction_timestamp
+                    }
             
             # Get actions
-            cursor.execute(
-                "SELECT action, priority, status FROM actions WHERE conversation_id = ?",
-                (conversation_id,)
-            )
-            actions = cursor.fetchall()
-            results["actions"]["action_items"] = [
-                {"action": action, "priority": priority, "status": status}
-                for action, priority, status in actions
-            ]
-            results["actions"]["total_actions"] = len(results["actions"]["action_items"])
+            if "actions" in wanted:
+                cursor.execute(
+                    _SQL_SELECT_ACTIONS,
+                    (conversation_id,)
+                )
+                actions = cursor.fetchall()
+                results["actions"]["action_items"] = [
+                    {"action": action, "priority": priority, "status": status}
+                    for action, priority, status in actions
+                ]
+                results["actions"]["total_actions"] = len(results["actions"]["action_items"])
+            
+            self._cache_read(key, version, results)
+            return results
             
-            # Get routing decision
-            cursor.execute(
-                "SELECT recommended_team, confidence, justification, timestamp FROM routing_decisions WHERE conversation_id = ? ORDER BY timestamp DESC LIMIT 1",
-                (conversation_id,)
-            )
-            routing = cursor.fetchone()
-            if routing:
-                team, confidence, justification, timestamp = routing
-                results["routing"] = {
-                    "recommended_team": team,
-                    "confidence": confidence,
-                    "justification": justification,
-                    "timestamp": timestamp
-                }
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting processing results: {e}")
+            return results
+    
+    def get_processing_overview(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Get the sizes and first entries of a conversation's stored result lists
+        
+        The counts and first items are computed inside SQLite, so no stored list is
+        parsed in Python. Useful for dashboards that only show totals.
+        
+        Args:
+            conversation_id: The ID of the conversation
             
-            # Get resolution recommendation
-            cursor.execute(
-                "SELECT immediate_steps, complete_resolution_path, reasoning, confidence_score, timestamp FROM resolution_recommendations WHERE conversation_id = ? ORDER BY timestamp DESC LIMIT 1",
-                (conversation_id,)
-            )
-            recommendation = cursor.fetchone()
-            if recommendation:
-                immediate_steps, complete_path, reasoning, confidence, timestamp = recommendation
-                results["recommendations"] = {
-                    "immediate_steps": json.loads(immediate_steps),
-                    "complete_resolution_path": json.loads(complete_path),
-                    "reasoning": reasoning,
-                    "confidence_score": confidence,
-                    "timestamp": timestamp
-                }
+        Returns:
+            Dictionary with action, step and factor counts plus the first immediate step
+            and the top factor (None when there are none)
+        """
+        overview = {
+            "total_actions": 0,
+            "total_immediate_steps": 0,
+            "first_immediate_step": None,
+            "total_resolution_steps": 0,
+            "total_factors": 0,
+            "top_factor": None
+        }
+        
+        conn = self._get_connection()
+        
+        try:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_SELECT_PROCESSING_OVERVIEW, {"conversation_id": conversation_id})
+            actions, steps, first_step, resolution_steps, factors, top_factor = cursor.fetchone()
             
-            # Get time prediction
-            cursor.execute(
-                "SELECT predicted_category, estimated_hours, confidence_score, factors, timestamp FROM time_predictions WHERE conversation_id = ? ORDER BY timestamp DESC LIMIT 1",
-                (conversation_id,)
-            )
-            prediction = cursor.fetchone()
-            if prediction:
-                category, hours, confidence, factors, timestamp = prediction
-                results["time_prediction"] = {
-                    "predicted_category": category,
-                    "estimated_hours": hours,
-                    "confidence_score": confidence,
-                    "factors": json.loads(factors),
-                    "timestamp": timestamp
-                }
+            overview["total_actions"] = actions
+            overview["total_immediate_steps"] = steps or 0
+            overview["first_immediate_step"] = first_step
+            overview["total_resolution_steps"] = resolution_steps or 0
+            overview["total_factors"] = factors or 0
+            overview["top_factor"] = top_factor
             
-            return results
+            return overview
             
         except sqlite3.Error as e:
-            self.logger.error(f"Error getting processing results: {e}")
-            return results
-        finally:
-            conn.close()
+            self.logger.error(f"Error getting processing overview: {e}")
+            return overview
 
 
 # Initialize the database when run directly
@@ -1,8 +1,159 @@
 import os
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import random
 import requests
+from requests.adapters import HTTPAdapter
+import sqlite3
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, List, Tuple, TypeVar, Union
+import numpy as np
+
+try:
+    import aiohttp
+except ImportError:
+    # Optional; batch_generate falls back to sequential requests
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    # Optional; request and response bodies fall back to the stdlib json module
+    orjson = None
+
+# Persistent embedding cache, keyed by server, model and a hash of the text
+_SQL_CREATE_EMBEDDING_CACHE = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    provider TEXT,
+    model TEXT,
+    hash TEXT,
+    vec BLOB,    -- The embedding vector as raw float32 bytes
+    ts INTEGER,
+    PRIMARY KEY (provider, model, hash)
+)
+"""
+_SQL_SELECT_CACHED_EMBEDDING = "SELECT vec FROM embedding_cache WHERE provider = ? AND model = ? AND hash = ?"
+_SQL_INSERT_CACHED_EMBEDDING = "INSERT OR REPLACE INTO embedding_cache (provider, model, hash, vec, ts) VALUES (?, ?, ?, ?, ?)"
+
+# Set up logging once at import, unless the application already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, 
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# Upper bound in seconds on the backoff between retries of a failed API call
+_MAX_RETRY_DELAY = 30.0
+
+T = TypeVar("T")
+
+# Header sent with request bodies serialized by _dumps
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a request body"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value).encode()
+
+def _loads(value: bytes) -> Any:
+    """Parse a response body"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+# Canned responses used when simulating the LLM, picked by the first entry of
+# _SIMULATED_RESPONSES with a keyword in the lowercased prompt
+_SIMULATED_SUMMARY = "This is a simulated summary of the conversation. The customer was experiencing login issues with their account. The agent sent a password reset link to the customer's email, and the customer confirmed they would check their email."
+
+_SIMULATED_ACTIONS = """
+            {
+                "action_items": [
+                    {
+                        "action": "Send password reset link to customer",
+                        "priority": "High",
+                        "status": "Completed"
+                    },
+                    {
+                        "action": "Follow up with customer to confirm successful login",
+                        "priority": "Medium",
+                        "status": "Pending"
+                    }
+                ],
+                "total_actions": 2
+            }
+            """
+
+_SIMULATED_ROUTING = """
+            {
+                "recommended_team": "Account Management",
+                "confidence": "High",
+                "justification": "This is an account access issue related to password problems.",
+                "timestamp": "2023-06-15 10:15:00"
+            }
+            """
+
+_SIMULATED_RECOMMENDATION = """
+            {
+                "immediate_steps": [
+                    {"action": "Verify refund status", "details": "Check if refund has been processed"},
+                    {"action": "Send confirmation email", "details": "Ensure customer receives refund confirmation"}
+                ],
+                "complete_resolution_path": [
+                    {"action": "Monitor account", "details": "Watch for any similar issues"},
+                    {"action": "Update documentation", "details": "Document the resolution process"}
+                ],
+                "reasoning": "Password reset is the standard procedure for login issues when the customer cannot access their account.",
+                "confidence_score": 0.85
+            }
+            """
+
+_SIMULATED_TIME_PREDICTION = """
+            {
+                "resolution_time_category": "quick",
+                "estimated_time": "2 hours",
+                "explanation": "Simple issue with standard resolution path."
+            }
+            """
+
+_SIMULATED_DEFAULT = "I'm not sure how to respond to that prompt."
+
+_SIMULATED_RESPONSES = (
+    (("summarize",), _SIMULATED_SUMMARY),
+    (("action", "extract"), _SIMULATED_ACTIONS),
+    (("route", "team"), _SIMULATED_ROUTING),
+    (("resolution", "recommend"), _SIMULATED_RECOMMENDATION),
+    (("time", "predict"), _SIMULATED_TIME_PREDICTION),
+)
+
+def _to_vector(values: Optional[List[float]]) -> Optional[np.ndarray]:
+    """
+    Convert embedding values to a unit-length float32 vector
+    
+    The vector is read-only, since the caches hand the same array to every caller.
+    
+    Returns:
+        The vector, or None if there are no values
+    """
+    if values is None or len(values) == 0:
+        return None
+    vector = np.asarray(values, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector = vector / norm
+    vector.flags.writeable = False
+    return vector
+
+@lru_cache(maxsize=4096)
+def _simulated_embedding(text: str) -> np.ndarray:
+    """Deterministic 10-dimensional pseudo-random vector for a text, seeded from its hash"""
+    seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+    return _to_vector(np.random.default_rng(seed).random(10, dtype=np.float32))
 
 class LLMInterface:
     """Interface for API calls to on-premises LLM (e.g., via Ollama)"""
@@ -11,7 +162,17 @@ class LLMInterface:
                  model: str = "llama2", 
                  max_retries: int = 3, 
                  retry_delay: float = 1.0,
-                 simulate: bool = False):
+                 simulate: bool = False,
+                 cache_size: int = 512,
+                 cache_ttl: Optional[float] = 3600.0,
+                 semantic_cache_threshold: Optional[float] = None,
+                 embedding_cache_size: int = 2048,
+                 embedding_cache_path: Optional[str] = None,
+                 connect_timeout: float = 2.0,
+                 breaker_threshold: int = 5,
+                 breaker_cooldown: float = 30.0,
+                 keep_alive: Union[str, float] = "1h",
+                 preload: bool = False):
         """
         Initialize the LLM interface
         
@@ -19,30 +180,442 @@ class LLMInterface:
             base_url: Base URL for the LLM API
             model: Default model to use
             max_retries: Maximum number of retries for failed API calls
-            retry_delay: Delay between retries in seconds
+            retry_delay: Base delay between retries in seconds; doubles with each attempt, with jitter
             simulate: Whether to simulate responses (for testing without LLM)
+            cache_size: Maximum number of generated responses to keep for reuse (0 disables caching)
+            cache_ttl: Seconds a cached response stays valid, or None to keep it until evicted
+            semantic_cache_threshold: Optional cosine similarity above which a cached response
+                to a different but similar prompt is reused; costs one embedding request per
+                cache miss, so it is off by default
+            embedding_cache_size: Maximum number of embeddings to keep in memory
+            embedding_cache_path: Optional SQLite file that keeps embeddings across restarts
+            connect_timeout: Seconds to wait for a connection to the LLM server, separate from
+                the (much longer) time allowed for the response
+            breaker_threshold: Consecutive failed API calls after which calls are skipped (and
+                answered by the simulated fallback) for breaker_cooldown seconds; 0 disables this
+            breaker_cooldown: Seconds to skip calls for before letting a single probe call through
+            keep_alive: How long Ollama keeps the model loaded after each request, as a duration
+                such as "1h" or seconds (-1 keeps it loaded)
+            preload: Load the default model in the background now (see warmup), so the first
+                request does not wait for it
         """
         self.base_url = base_url
         self.default_model = model
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.simulate = simulate
+        self.connect_timeout = connect_timeout
+        self.keep_alive = keep_alive
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.semantic_cache_threshold = semantic_cache_threshold
+        
+        # Generated responses by hash of (model, temperature, max_tokens, prompt), as
+        # (expires_at, response) in least recently used order
+        self._response_cache: "OrderedDict[bytes, Tuple[Optional[float], str]]" = OrderedDict()
+        
+        # Normalized prompt embeddings for the semantic cache, one row per entry, filled as
+        # a ring buffer; entries hold ((model, temperature, max_tokens), expires_at, response)
+        self._semantic_vectors: Optional[np.ndarray] = None
+        self._semantic_entries: List[Tuple[Tuple[str, float, int], Optional[float], str]] = []
+        self._semantic_next = 0
+        self._cache_lock = threading.Lock()
+        
+        # Futures for responses being generated, by cache key (and event loop for the async
+        # ones), so identical concurrent requests share one call to the LLM server
+        self._inflight: Dict[bytes, concurrent.futures.Future] = {}
+        self._ainflight: Dict[Tuple[asyncio.AbstractEventLoop, bytes], asyncio.Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Embeddings by (model, text hash) in least recently used order, backed by an
+        # optional SQLite file, with hit and miss counts for embedding_cache_info
+        self.embedding_cache_size = embedding_cache_size
+        self._embedding_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._embedding_db: Optional[sqlite3.Connection] = None
+        if embedding_cache_path:
+            self._embedding_db = sqlite3.connect(embedding_cache_path, check_same_thread=False)
+            self._embedding_db.execute("PRAGMA journal_mode=WAL")
+            self._embedding_db.execute(_SQL_CREATE_EMBEDDING_CACHE)
+            self._embedding_db.commit()
+        self._embedding_hits = 0
+        self._embedding_misses = 0
+        self._embedding_lock = threading.Lock()
+        
+        # Whether the server accepts batched /embed requests; cleared on the first 404
+        self._batch_embed_supported = True
+        
+        # Circuit breaker: consecutive calls that failed every attempt, and when the circuit
+        # last opened (or let a probe through)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._breaker_failures = 0
+        self._breaker_opened_at = 0.0
+        self._breaker_lock = threading.Lock()
         
         # Set up logging
-        logging.basicConfig(level=logging.INFO, 
-                            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger("LLMInterface")
         
-    def generate_response(self, prompt: str, model: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 1000, use_openrouter: bool = False) -> str:
+        # Keep connections to the LLM server alive across calls; retries are handled
+        # by the call sites, so the adapter itself does not retry
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
+        if preload and not simulate:
+            self.warmup()
+    
+    def warmup(self, model: Optional[str] = None) -> threading.Thread:
+        """
+        Load a model into the LLM server's memory in the background
+        
+        Sends an empty prompt, which makes Ollama load the model without generating
+        anything; keep_alive then keeps it loaded between requests.
+        
+        Args:
+            model: The model to load (defaults to self.default_model)
+            
+        Returns:
+            The daemon thread sending the request, for callers that want to wait for it
+        """
+        model = model or self.default_model
+        
+        def load() -> None:
+            start = time.monotonic()
+            try:
+                # Loading a large model from disk can take well over a minute
+                response = self._session.post(
+                    f"{self.base_url}/generate",
+                    data=_dumps({
+                        "model": model,
+                        "prompt": "",
+                        "keep_alive": self.keep_alive,
+                        "stream": False
+                    }),
+                    headers=_JSON_HEADERS,
+                    timeout=(self.connect_timeout, 120)
+                )
+                response.raise_for_status()
+                self.logger.info("Loaded model %s in %.1f seconds", model, time.monotonic() - start)
+            except requests.exceptions.RequestException as e:
+                self.logger.warning("Could not preload model %s: %s", model, e)
+        
+        thread = threading.Thread(target=load, name=f"warmup-{model}", daemon=True)
+        thread.start()
+        return thread
+    
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections, and the embedding cache file"""
+        self._session.close()
+        if self._embedding_db is not None:
+            self._embedding_db.close()
+            self._embedding_db = None
+    
+    def __enter__(self) -> "LLMInterface":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _cached_response(self, key: bytes) -> Optional[str]:
+        """Look up an unexpired cached response by its exact key"""
+        with self._cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+            return response
+    
+    def _similar_cached_response(self, params: Tuple[str, float, int], embedding: Optional[np.ndarray]) -> Optional[str]:
+        """
+        Look up the cached response whose prompt is most similar to the given one
+        
+        Args:
+            params: The (model, temperature, max_tokens) the response must have been generated with
+            embedding: Normalized embedding of the prompt
+            
+        Returns:
+            The response, or None if no unexpired entry reaches semantic_cache_threshold
+        """
+        if embedding is None:
+            return None
+        
+        with self._cache_lock:
+            vectors = self._semantic_vectors
+            if vectors is None or vectors.shape[1] != embedding.size:
+                return None
+            
+            scores = vectors[:len(self._semantic_entries)] @ embedding
+            candidates = np.flatnonzero(scores >= self.semantic_cache_threshold)
+            now = time.monotonic()
+            for i in candidates[np.argsort(-scores[candidates])]:
+                entry_params, expires_at, response = self._semantic_entries[i]
+                if entry_params == params and (expires_at is None or expires_at > now):
+                    return response
+        return None
+    
+    def _cache_response(self, key: bytes, params: Tuple[str, float, int], embedding: Optional[np.ndarray], response: str) -> None:
+        """Store a generated response, evicting the oldest entries when the cache is full"""
+        expires_at = None if self.cache_ttl is None else time.monotonic() + self.cache_ttl
+        
+        with self._cache_lock:
+            self._response_cache[key] = (expires_at, response)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > self.cache_size:
+                self._response_cache.popitem(last=False)
+            
+            if embedding is None:
+                return
+            
+            # Start over if the embedding model (and so the dimension) changed
+            if self._semantic_vectors is None or self._semantic_vectors.shape[1] != embedding.size:
+                self._semantic_vectors = np.empty((self.cache_size, embedding.size), dtype=np.float32)
+                self._semantic_entries = []
+                self._semantic_next = 0
+            
+            row = self._semantic_next
+            self._semantic_vectors[row] = embedding
+            entry = (params, expires_at, response)
+            if row < len(self._semantic_entries):
+                self._semantic_entries[row] = entry
+            else:
+                self._semantic_entries.append(entry)
+            self._semantic_next = (row + 1) % self.cache_size
+    
+    @staticmethod
+    def _cache_key(prompt: str, params: Tuple[str, float, int]) -> bytes:
+        """Hash a prompt and its generation parameters into a response cache key"""
+        model, temperature, max_tokens = params
+        return hashlib.blake2b(f"{model}\0{temperature}\0{max_tokens}\0{prompt}".encode(), digest_size=16).digest()
+    
+    def embedding_cache_info(self) -> Dict[str, int]:
+        """
+        Get embedding cache statistics
+        
+        Returns:
+            Dictionary with the number of hits, misses and embeddings held in memory
+        """
+        with self._embedding_lock:
+            return {
+                "hits": self._embedding_hits,
+                "misses": self._embedding_misses,
+                "size": len(self._embedding_cache)
+            }
+    
+    def _cached_embedding(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        """Look up an embedding in memory, then in the embedding cache file"""
+        with self._embedding_lock:
+            embeddings = self._embedding_cache.get(key)
+            if embeddings is None and self._embedding_db is not None:
+                row = self._embedding_db.execute(_SQL_SELECT_CACHED_EMBEDDING, (self.base_url, *key)).fetchone()
+                if row is not None:
+                    embeddings = np.frombuffer(row[0], dtype=np.float32)
+                    self._remember_embedding(key, embeddings)
+            
+            if embeddings is None:
+                self._embedding_misses += 1
+                return None
+            
+            self._embedding_cache.move_to_end(key)
+            self._embedding_hits += 1
+            return embeddings
+    
+    def _cache_embedding(self, key: Tuple[str, str], embeddings: np.ndarray) -> None:
+        """Store an embedding in memory and in the embedding cache file"""
+        with self._embedding_lock:
+            self._remember_embedding(key, embeddings)
+            if self._embedding_db is not None:
+                self._embedding_db.execute(
+                    _SQL_INSERT_CACHED_EMBEDDING,
+                    (self.base_url, *key, embeddings.tobytes(), int(time.time()))
+                )
+                self._embedding_db.commit()
+    
+    def _remember_embedding(self, key: Tuple[str, str], embeddings: np.ndarray) -> None:
+        """Add an embedding to the in-memory cache, evicting the least recently used ones; call with the lock held"""
+        self._embedding_cache[key] = embeddings
+        self._embedding_cache.move_to_end(key)
+        while len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+    
+    @staticmethod
+    def _embedding_key(text: str, model: str) -> Tuple[str, str]:
+        """Key an embedding by model and a hash of the text"""
+        return model, hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retrying a failed API call
+        
+        Uses truncated exponential backoff with full jitter, so that clients failing
+        together do not all retry at the same moment. A Retry-After header given in
+        seconds is honoured as a minimum.
+        
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            retry_after: Retry-After header of the failed response, if any
+        """
+        delay = random.uniform(0, min(_MAX_RETRY_DELAY, self.retry_delay * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+    
+    @staticmethod
+    def _retryable_status(status: Optional[int]) -> bool:
+        """Whether an HTTP error status is worth retrying (rate limiting or a server error)"""
+        return status is not None and (status == 429 or status >= 500)
+    
+    def _breaker_attempts(self) -> int:
+        """
+        Number of attempts the circuit breaker allows for the next API call
+        
+        Returns:
+            max_retries while the circuit is closed, 1 for a probe once an open circuit has
+            cooled down (which restarts the cooldown for everyone else), and 0 otherwise
+        """
+        with self._breaker_lock:
+            if self.breaker_threshold <= 0 or self._breaker_failures < self.breaker_threshold:
+                return self.max_retries
+            now = time.monotonic()
+            if now - self._breaker_opened_at < self.breaker_cooldown:
+                return 0
+            self._breaker_opened_at = now
+            return 1
+    
+    def _breaker_record(self, reachable: bool) -> None:
+        """Record whether an API call reached the server, opening the circuit after too many failures"""
+        with self._breaker_lock:
+            if reachable:
+                self._breaker_failures = 0
+                return
+            self._breaker_failures += 1
+            if self.breaker_threshold > 0 and self._breaker_failures >= self.breaker_threshold:
+                self._breaker_opened_at = time.monotonic()
+                if self._breaker_failures == self.breaker_threshold:
+                    self.logger.warning(
+                        "LLM server unreachable for %s calls in a row; skipping calls for %s seconds",
+                        self._breaker_failures, self.breaker_cooldown
+                    )
+    
+    def _with_retries(self, call: Callable[[], Optional[T]], description: str) -> Optional[T]:
+        """
+        Make an API call, retrying timeouts, connection errors, 429 and 5xx responses
+        
+        Client errors such as 400 or 404 are not retried. While the circuit breaker is
+        open the call is skipped; see breaker_threshold.
+        
+        Args:
+            call: Makes one attempt and returns its result, or None for an empty result
+            description: What the call is, for the log (e.g. "API call")
+            
+        Returns:
+            The result, or None if every attempt failed or the call was skipped
+        """
+        attempts = self._breaker_attempts()
+        if not attempts:
+            self.logger.info("Skipping %s while the LLM server is unreachable", description)
+            return None
+        
+        start = time.monotonic()
+        for attempt in range(attempts):
+            retry_after = None
+            try:
+                result = call()
+                if result is not None:
+                    self._breaker_record(True)
+                    return result
+                error = "empty result"
+                
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if not self._retryable_status(status):
+                    self._breaker_record(True)
+                    self.logger.error(f"{description} rejected: {e}")
+                    return None
+                retry_after = e.response.headers.get("Retry-After")
+                error = e
+                
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # ValueError covers a response body that is not valid JSON
+                error = e
+            
+            self.logger.warning(f"{description} failed (attempt {attempt+1}/{attempts}): {error}")
+            if attempt < attempts - 1:
+                delay = self._backoff_delay(attempt, retry_after)
+                self.logger.info("Retrying in %.2f seconds...", delay)
+                time.sleep(delay)
+        
+        self.logger.error(f"All {description} retry attempts failed after {time.monotonic() - start:.1f} seconds")
+        self._breaker_record(False)
+        return None
+    
+    async def _awith_retries(self, call: Callable[[], Awaitable[Optional[T]]], description: str) -> Optional[T]:
+        """
+        Make an API call without blocking the event loop, retrying like _with_retries
+        
+        Args:
+            call: Makes one attempt and returns its result, or None for an empty result
+            description: What the call is, for the log (e.g. "API call")
+            
+        Returns:
+            The result, or None if every attempt failed or the call was skipped
+        """
+        attempts = self._breaker_attempts()
+        if not attempts:
+            self.logger.info("Skipping %s while the LLM server is unreachable", description)
+            return None
+        
+        start = time.monotonic()
+        for attempt in range(attempts):
+            retry_after = None
+            try:
+                result = await call()
+                if result is not None:
+                    self._breaker_record(True)
+                    return result
+                error = "empty result"
+                
+            except aiohttp.ClientResponseError as e:
+                if not self._retryable_status(e.status):
+                    self._breaker_record(True)
+                    self.logger.error(f"{description} rejected: {e}")
+                    return None
+                retry_after = e.headers.get("Retry-After") if e.headers else None
+                error = e
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                # Timeouts have no message of their own; ValueError covers a body that is not valid JSON
+                error = str(e) or repr(e)
+            
+            self.logger.warning(f"{description} failed (attempt {attempt+1}/{attempts}): {error}")
+            if attempt < attempts - 1:
+                delay = self._backoff_delay(attempt, retry_after)
+                self.logger.info("Retrying in %.2f seconds...", delay)
+                await asyncio.sleep(delay)
+        
+        self.logger.error(f"All {description} retry attempts failed after {time.monotonic() - start:.1f} seconds")
+        self._breaker_record(False)
+        return None
+    
+    def generate_response(self, prompt: str, model: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 1000, use_openrouter: bool = False,
+                          no_cache: bool = False) -> str:
         """
         Generate a response using the configured LLM
         
+        Responses to a prompt already answered with the same model, temperature and
+        max_tokens are served from the cache; see cache_size and semantic_cache_threshold.
+        
         Args:
             prompt: The input prompt
             model: The model to use (defaults to self.default_model)
             temperature: Temperature for response generation
             max_tokens: Maximum tokens to generate
             use_openrouter: Ignored parameter (kept for backwards compatibility)
+            no_cache: Always query the LLM, and do not cache the response
             
         Returns:
             The generated response
@@ -52,57 +625,345 @@ class LLMInterface:
             return self._simulate_response(prompt)
         
         model = model or self.default_model
-        self.logger.info(f"Generating response using model: {model}")
+        params = (model, temperature, max_tokens)
+        key, embedding, cached = self._lookup_response(prompt, params, no_cache)
+        if cached is not None:
+            return cached
         
-        for attempt in range(self.max_retries):
-            try:
-                # Increase timeout to 60 seconds
-                response = requests.post(
+        def request() -> str:
+            self.logger.info("Generating response using model: %s", model)
+            
+            def attempt() -> str:
+                # Fail fast on connecting, but allow 60 seconds for the response
+                response = self._session.post(
                     f"{self.base_url}/generate",
-                    json={
+                    data=_dumps({
                         "model": model,
                         "prompt": prompt,
                         "temperature": temperature,
                         "max_tokens": max_tokens,
+                        "keep_alive": self.keep_alive,
                         "stream": False
-                    },
-                    timeout=60  # Increased timeout
+                    }),
+                    headers=_JSON_HEADERS,
+                    timeout=(self.connect_timeout, 60)
                 )
                 
                 # Check if request was successful
                 response.raise_for_status()
                 
                 # Parse response
-                result = response.json()
-                self.logger.debug(f"LLM response received: {result}")
+                result = _loads(response.content)
+                self.logger.debug("LLM response received: %s", result)
                 
                 return result.get("response", "")
+            
+            text = self._with_retries(attempt, "API call")
+            if text is None:
+                # Fall back to simulated response if all retries fail
+                self.logger.info("Falling back to simulated response")
+                return self._simulate_response(prompt)
+            
+            if key is not None:
+                self._cache_response(key, params, embedding, text)
+            return text
+        
+        return self._coalesced(key, request)
+    
+    def generate_response_stream(self, prompt: str, model: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 1000,
+                                 no_cache: bool = False) -> Iterator[str]:
+        """
+        Generate a response, yielding pieces of it as the LLM produces them
+        
+        Only opening the stream is retried: if that fails, the simulated fallback is
+        yielded in one piece, and if the connection drops mid-stream the error is
+        logged and the stream ends early. Cached responses are yielded in one piece,
+        and a completely streamed response is cached like those of generate_response.
+        
+        Args:
+            prompt: The input prompt
+            model: The model to use (defaults to self.default_model)
+            temperature: Temperature for response generation
+            max_tokens: Maximum tokens to generate
+            no_cache: Always query the LLM, and do not cache the response
+            
+        Yields:
+            Successive pieces of the generated response
+        """
+        if self.simulate:
+            self.logger.info("Simulating LLM response")
+            yield self._simulate_response(prompt)
+            return
+        
+        model = model or self.default_model
+        params = (model, temperature, max_tokens)
+        key, embedding, cached = self._lookup_response(prompt, params, no_cache)
+        if cached is not None:
+            yield cached
+            return
+        
+        self.logger.info("Streaming response using model: %s", model)
+        
+        def attempt() -> requests.Response:
+            response = self._session.post(
+                f"{self.base_url}/generate",
+                data=_dumps({
+                    "model": model,
+                    "prompt": prompt,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                    "keep_alive": self.keep_alive,
+                    "stream": True
+                }),
+                headers=_JSON_HEADERS,
+                stream=True,
+                timeout=(self.connect_timeout, 60)
+            )
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                response.close()
+                raise
+            return response
+        
+        response = self._with_retries(attempt, "API call")
+        if response is None:
+            self.logger.info("Falling back to simulated response")
+            yield self._simulate_response(prompt)
+            return
+        
+        # Each line is a JSON object holding the next piece, until one with done set
+        parts = []
+        done = False
+        with response:
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    piece = chunk.get("response", "")
+                    if piece:
+                        parts.append(piece)
+                        yield piece
+                    if chunk.get("done"):
+                        done = True
+                        break
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self.logger.error(f"Response stream interrupted: {e}")
+        
+        if done and key is not None:
+            self._cache_response(key, params, embedding, "".join(parts))
+    
+    def _lookup_response(self, prompt: str, params: Tuple[str, float, int], no_cache: bool) -> Tuple[Optional[bytes], Optional[np.ndarray], Optional[str]]:
+        """
+        Look up a cached response for a prompt
+        
+        Args:
+            prompt: The input prompt
+            params: The (model, temperature, max_tokens) to generate with
+            no_cache: Skip the cache entirely
+            
+        Returns:
+            Tuple of (key, embedding, response); pass the key and embedding to
+            _cache_response on a miss. The key is None when caching is off.
+        """
+        if self.cache_size <= 0 or no_cache:
+            return None, None, None
+        
+        # Serve repeated (or, with a semantic threshold, similar) prompts from the cache
+        key = self._cache_key(prompt, params)
+        embedding = None
+        cached = self._cached_response(key)
+        if cached is None and self.semantic_cache_threshold is not None:
+            embedding = self._embed(prompt)
+            cached = self._similar_cached_response(params, embedding)
+        if cached is not None:
+            self.logger.info("Using cached LLM response")
+        return key, embedding, cached
+    
+    def _coalesced(self, key: Optional[bytes], request: Callable[[], str]) -> str:
+        """
+        Generate a response, sharing it with identical requests made while it is in flight
+        
+        Concurrent callers with the same cache key wait for the first caller's response
+        instead of each sending the prompt to the LLM server.
+        
+        Args:
+            key: Cache key from _lookup_response, or None to never share the response
+            request: Generates (and caches) the response
+            
+        Returns:
+            The generated response
+        """
+        if key is None:
+            return request()
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = concurrent.futures.Future()
+        
+        if not leader:
+            self.logger.info("Waiting for an identical in-flight LLM request")
+            return future.result()
+        
+        try:
+            # The previous caller may have cached a response since the lookup
+            text = self._cached_response(key)
+            if text is None:
+                text = request()
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    async def _acoalesced(self, key: Optional[bytes], request: Callable[[], Awaitable[str]]) -> str:
+        """Generate a response without blocking the event loop, sharing it like _coalesced"""
+        if key is None:
+            return await request()
+        
+        # asyncio futures belong to one event loop, so only share within the running loop
+        inflight_key = (asyncio.get_running_loop(), key)
+        with self._inflight_lock:
+            future = self._ainflight.get(inflight_key)
+            leader = future is None
+            if leader:
+                future = self._ainflight[inflight_key] = inflight_key[0].create_future()
+        
+        if not leader:
+            self.logger.info("Waiting for an identical in-flight LLM request")
+            # Shielded so that a waiter being cancelled does not cancel the shared request
+            return await asyncio.shield(future)
+        
+        try:
+            text = self._cached_response(key)
+            if text is None:
+                text = await request()
+            future.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved, in case nobody was waiting for it
+            future.exception()
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._ainflight[inflight_key]
+    
+    @asynccontextmanager
+    async def _async_session(self, session: Optional["aiohttp.ClientSession"] = None) -> AsyncIterator["aiohttp.ClientSession"]:
+        """Yield the given aiohttp session, or a new pooled one that is closed on exit"""
+        if session is not None:
+            yield session
+            return
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75)
+        ) as new_session:
+            yield new_session
+    
+    async def agenerate_response(self, prompt: str, model: Optional[str] = None, temperature: float = 0.7, max_tokens: int = 1000,
+                                 no_cache: bool = False, session: Optional["aiohttp.ClientSession"] = None) -> str:
+        """
+        Generate a response without blocking the event loop (requires aiohttp)
+        
+        Behaves like generate_response, including the cache, retries and the simulated fallback.
+        
+        Args:
+            prompt: The input prompt
+            model: The model to use (defaults to self.default_model)
+            temperature: Temperature for response generation
+            max_tokens: Maximum tokens to generate
+            no_cache: Always query the LLM, and do not cache the response
+            session: Optional aiohttp session to reuse; a temporary one is opened otherwise
+            
+        Returns:
+            The generated response
+        """
+        if self.simulate:
+            self.logger.info("Simulating LLM response")
+            return self._simulate_response(prompt)
+        
+        model = model or self.default_model
+        params = (model, temperature, max_tokens)
+        key = embedding = None
+        
+        async with self._async_session(session) as session:
+            # Serve repeated (or, with a semantic threshold, similar) prompts from the cache
+            if self.cache_size > 0 and not no_cache:
+                key = self._cache_key(prompt, params)
+                cached = self._cached_response(key)
+                if cached is None and self.semantic_cache_threshold is not None:
+                    embedding = await self._aembed(prompt, session=session)
+                    cached = self._similar_cached_response(params, embedding)
+                if cached is not None:
+                    self.logger.info("Using cached LLM response")
+                    return cached
+            
+            async def request() -> str:
+                self.logger.info("Generating response using model: %s", model)
                 
-            except requests.exceptions.Timeout:
-                self.logger.warning(f"Request timed out (attempt {attempt+1}/{self.max_retries})")
-                if attempt < self.max_retries - 1:
-                    self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
-                else:
-                    self.logger.error("All retry attempts timed out")
-                    return self._simulate_response(prompt)
+                async def attempt() -> str:
+                    async with session.post(
+                        f"{self.base_url}/generate",
+                        data=_dumps({
+                            "model": model,
+                            "prompt": prompt,
+                            "temperature": temperature,
+                            "max_tokens": max_tokens,
+                            "keep_alive": self.keep_alive,
+                            "stream": False
+                        }),
+                        headers=_JSON_HEADERS,
+                        timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=60)
+                    ) as response:
+                        response.raise_for_status()
+                        result = _loads(await response.read())
                     
-            except requests.exceptions.RequestException as e:
-                self.logger.warning(f"API call failed (attempt {attempt+1}/{self.max_retries}): {e}")
+                    self.logger.debug("LLM response received: %s", result)
+                    return result.get("response", "")
                 
-                if attempt < self.max_retries - 1:
-                    self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
-                else:
-                    self.logger.error(f"All retry attempts failed: {e}")
-                    # Fall back to simulated response if all retries fail
+                text = await self._awith_retries(attempt, "API call")
+                if text is None:
                     self.logger.info("Falling back to simulated response")
                     return self._simulate_response(prompt)
+                
+                if key is not None:
+                    self._cache_response(key, params, embedding, text)
+                return text
+            
+            return await self._acoalesced(key, request)
+    
+    async def abatch_generate(self, prompts: List[str], concurrency: int = 8, **kwargs) -> List[str]:
+        """
+        Generate responses for multiple prompts concurrently (requires aiohttp)
         
-        # This should never be reached due to the else clause in the last iteration
-        return self._simulate_response(prompt)
+        Args:
+            prompts: The input prompts
+            concurrency: Maximum number of requests in flight at once
+            **kwargs: Passed on to agenerate_response
+            
+        Returns:
+            The generated responses, in the same order as the prompts
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async with self._async_session() as session:
+            async def bounded(prompt: str) -> str:
+                async with semaphore:
+                    return await self.agenerate_response(prompt, session=session, **kwargs)
+            
+            return await asyncio.gather(*(bounded(prompt) for prompt in prompts))
     
-    def get_embeddings(self, text: str, model: Optional[str] = None, use_openrouter: bool = False) -> List[float]:
+    def get_embeddings(self, text: str, model: Optional[str] = None, use_openrouter: bool = False, *,
+                       as_array: bool = True) -> Union[np.ndarray, List[float]]:
         """
         Get embeddings for the given text using Ollama
         
@@ -110,67 +971,268 @@ class LLMInterface:
             text: The text to embed
             model: The embedding model to use (defaults to self.default_model)
             use_openrouter: Ignored parameter (kept for backwards compatibility)
+            as_array: Return a read-only float32 array; pass False for a list of floats
             
         Returns:
-            List of embedding values
+            The embedding, normalized to unit length so cosine similarity is a dot product
         """
         if self.simulate:
             self.logger.info("Simulating embeddings")
-            # Return a small random embedding vector for simulation
-            import random
-            return [random.random() for _ in range(10)]
+            embeddings = self._simulate_embeddings(text)
+        else:
+            # Try the cache, then Ollama embeddings
+            embeddings = self._embed(text, model)
+            if embeddings is None:
+                # Fallback to simulated embeddings
+                self.logger.info("Generating simulated embeddings as final fallback")
+                embeddings = self._simulate_embeddings(text)
+        
+        return embeddings if as_array else embeddings.tolist()
+    
+    def get_embeddings_batch(self, texts: List[str], model: Optional[str] = None, batch_size: int = 64, *,
+                             as_array: bool = True) -> List[Union[np.ndarray, List[float]]]:
+        """
+        Get embeddings for several texts with as few requests as possible
+        
+        Duplicate and cached texts are not sent again. The rest go to Ollama's batch
+        /embed endpoint batch_size at a time; servers without it get concurrent
+        single requests instead. Must not be called from a running event loop.
+        
+        Args:
+            texts: The texts to embed
+            model: The embedding model to use (defaults to self.default_model)
+            batch_size: Maximum number of texts per request
+            as_array: Return read-only float32 arrays; pass False for lists of floats
+            
+        Returns:
+            List of unit-length embeddings, in the same order as the texts
+        """
+        if self.simulate:
+            self.logger.info("Simulating embeddings")
+            vectors = [self._simulate_embeddings(text) for text in texts]
+            return vectors if as_array else [vector.tolist() for vector in vectors]
         
-        # Try Ollama embeddings
         model = model or self.default_model
-        self.logger.info(f"Generating embeddings using model: {model}")
         
-        for attempt in range(self.max_retries):
-            try:
-                # The correct endpoint is /api/embeddings in newer Ollama versions
-                url = f"{self.base_url}/embeddings"
-                
-                self.logger.debug(f"Making embeddings request to: {url}")
-                response = requests.post(
-                    url,
-                    json={
+        # Look up each distinct text in the cache first
+        found: Dict[str, np.ndarray] = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            embeddings = self._cached_embedding(self._embedding_key(text, model))
+            if embeddings is None:
+                missing.append(text)
+            else:
+                found[text] = embeddings
+        
+        for start in range(0, len(missing), batch_size):
+            chunk = missing[start:start + batch_size]
+            results = None
+            if self._batch_embed_supported:
+                results = self._request_embeddings_batch(chunk, model)
+            if not self._batch_embed_supported:
+                if aiohttp is not None:
+                    results = asyncio.run(self._arequest_embeddings_many(chunk, model))
+                else:
+                    results = [self._request_embeddings(text, model) for text in chunk]
+            
+            for text, values in zip(chunk, results or []):
+                embeddings = _to_vector(values)
+                if embeddings is not None:
+                    self._cache_embedding(self._embedding_key(text, model), embeddings)
+                    found[text] = embeddings
+        
+        # Fall back to simulated embeddings for texts that could not be embedded
+        vectors = [found[text] if text in found else self._simulate_embeddings(text) for text in texts]
+        return vectors if as_array else [vector.tolist() for vector in vectors]
+    
+    def _request_embeddings_batch(self, texts: List[str], model: str) -> Optional[List[List[float]]]:
+        """
+        Request embeddings for several texts in one call to Ollama's /embed endpoint
+        
+        Returns:
+            List of embedding vectors in the same order as the texts, or None if the
+            server does not support batching or every attempt failed
+        """
+        self.logger.info("Generating %s embeddings using model: %s", len(texts), model)
+        
+        def attempt() -> Optional[List[List[float]]]:
+            response = self._session.post(
+                f"{self.base_url}/embed",
+                data=_dumps({
+                    "model": model,
+                    "input": texts,
+                    "keep_alive": self.keep_alive
+                }),
+                headers=_JSON_HEADERS,
+                timeout=(self.connect_timeout, 30 + len(texts))
+            )
+            
+            # Older Ollama versions only have the single-text /embeddings endpoint; an
+            # empty result (rather than None) stops _with_retries from retrying or logging it
+            if response.status_code == 404:
+                if self._batch_embed_supported:
+                    self._batch_embed_supported = False
+                    self.logger.info("Batch embeddings not supported by the server, sending single requests")
+                return []
+            response.raise_for_status()
+            
+            embeddings = _loads(response.content).get("embeddings", [])
+            if len(embeddings) != len(texts):
+                self.logger.warning(f"Expected {len(texts)} embeddings from Ollama API, received {len(embeddings)}")
+                return None
+            return embeddings
+        
+        return self._with_retries(attempt, "Ollama batch embeddings API call") or None
+    
+    async def _arequest_embeddings_many(self, texts: List[str], model: str, concurrency: int = 8) -> List[Optional[List[float]]]:
+        """Request embeddings for several texts concurrently over one aiohttp session"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async with self._async_session() as session:
+            async def bounded(text: str) -> Optional[List[float]]:
+                async with semaphore:
+                    return await self._arequest_embeddings(text, model, session)
+            
+            return await asyncio.gather(*(bounded(text) for text in texts))
+    
+    def _embed(self, text: str, model: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Get embeddings from the cache, requesting them from Ollama on a miss
+        
+        Returns:
+            Unit-length float32 embedding, or None if the request failed
+        """
+        key = self._embedding_key(text, model or self.default_model)
+        embeddings = self._cached_embedding(key)
+        if embeddings is None:
+            embeddings = _to_vector(self._request_embeddings(text, model))
+            if embeddings is not None:
+                self._cache_embedding(key, embeddings)
+        return embeddings
+    
+    def _request_embeddings(self, text: str, model: Optional[str] = None) -> Optional[List[float]]:
+        """
+        Request embeddings from Ollama, retrying failed calls
+        
+        Returns:
+            List of embedding values, or None if every attempt failed
+        """
+        model = model or self.default_model
+        self.logger.info("Generating embeddings using model: %s", model)
+        
+        def attempt() -> Optional[List[float]]:
+            # The correct endpoint is /api/embeddings in newer Ollama versions
+            url = f"{self.base_url}/embeddings"
+            
+            self.logger.debug("Making embeddings request to: %s", url)
+            response = self._session.post(
+                url,
+                data=_dumps({
+                    "model": model,
+                    "prompt": text,
+                    "keep_alive": self.keep_alive
+                }),
+                headers=_JSON_HEADERS,
+                timeout=(self.connect_timeout, 30)
+            )
+            
+            # Check if request was successful
+            response.raise_for_status()
+            
+            # Parse response
+            result = _loads(response.content)
+            self.logger.debug("Embedding response received")
+            
+            embeddings = result.get("embedding", [])
+            if not embeddings:
+                self.logger.warning("Empty embeddings received from Ollama API")
+                return None
+            return embeddings
+        
+        return self._with_retries(attempt, "Ollama embeddings API call")
+    
+    async def aget_embeddings(self, text: str, model: Optional[str] = None,
+                              session: Optional["aiohttp.ClientSession"] = None, *,
+                              as_array: bool = True) -> Union[np.ndarray, List[float]]:
+        """
+        Get embeddings for the given text without blocking the event loop (requires aiohttp)
+        
+        Behaves like get_embeddings, including retries and the simulated fallback.
+        
+        Args:
+            text: The text to embed
+            model: The embedding model to use (defaults to self.default_model)
+            session: Optional aiohttp session to reuse; a temporary one is opened otherwise
+            as_array: Return a read-only float32 array; pass False for a list of floats
+            
+        Returns:
+            The embedding, normalized to unit length so cosine similarity is a dot product
+        """
+        if self.simulate:
+            self.logger.info("Simulating embeddings")
+            embeddings = self._simulate_embeddings(text)
+        else:
+            embeddings = await self._aembed(text, model, session)
+            if embeddings is None:
+                # Fallback to simulated embeddings
+                self.logger.info("Generating simulated embeddings as final fallback")
+                embeddings = self._simulate_embeddings(text)
+        
+        return embeddings if as_array else embeddings.tolist()
+    
+    async def _aembed(self, text: str, model: Optional[str] = None,
+                      session: Optional["aiohttp.ClientSession"] = None) -> Optional[np.ndarray]:
+        """
+        Get embeddings from the cache, requesting them from Ollama on a miss without blocking the event loop
+        
+        Returns:
+            Unit-length float32 embedding, or None if the request failed
+        """
+        key = self._embedding_key(text, model or self.default_model)
+        embeddings = self._cached_embedding(key)
+        if embeddings is None:
+            embeddings = _to_vector(await self._arequest_embeddings(text, model, session))
+            if embeddings is not None:
+                self._cache_embedding(key, embeddings)
+        return embeddings
+    
+    async def _arequest_embeddings(self, text: str, model: Optional[str] = None,
+                                   session: Optional["aiohttp.ClientSession"] = None) -> Optional[List[float]]:
+        """
+        Request embeddings from Ollama without blocking the event loop, retrying failed calls
+        
+        Returns:
+            List of embedding values, or None if every attempt failed
+        """
+        model = model or self.default_model
+        self.logger.info("Generating embeddings using model: %s", model)
+        
+        async with self._async_session(session) as session:
+            async def attempt() -> Optional[List[float]]:
+                async with session.post(
+                    f"{self.base_url}/embeddings",
+                    data=_dumps({
                         "model": model,
-                        "prompt": text
-                    },
-                    timeout=30
-                )
+                        "prompt": text,
+                        "keep_alive": self.keep_alive
+                    }),
+                    headers=_JSON_HEADERS,
+                    timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=30)
+                ) as response:
+                    response.raise_for_status()
+                    result = _loads(await response.read())
                 
-                # Check if request was successful
-                response.raise_for_status()
-                
-                # Parse response
-                result = response.json()
                 self.logger.debug("Embedding response received")
                 
                 embeddings = result.get("embedding", [])
-                if embeddings:
-                    return embeddings
-                else:
+                if not embeddings:
                     self.logger.warning("Empty embeddings received from Ollama API")
-                    
-            except requests.exceptions.RequestException as e:
-                self.logger.warning(f"Ollama embeddings API call failed (attempt {attempt+1}/{self.max_retries}): {e}")
-                
-                if attempt < self.max_retries - 1:
-                    self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
-                else:
-                    self.logger.error(f"All Ollama embedding retry attempts failed: {e}")
-                    # Return simulated embeddings if all else fails
-                    self.logger.info("Generating simulated embeddings due to API failure")
-                    import random
-                    return [random.random() for _ in range(10)]
-        
-        # Fallback to simulated embeddings
-        self.logger.info("Generating simulated embeddings as final fallback")
-        import random
-        return [random.random() for _ in range(10)]
+                    return None
+                return embeddings
+            
+            return await self._awith_retries(attempt, "Ollama embeddings API call")
     
-    def _simulate_embeddings(self, text: str) -> List[float]:
+    def _simulate_embeddings(self, text: str) -> np.ndarray:
         """
         Generate simulated embeddings for demo purposes
         
@@ -178,87 +1240,36 @@ class LLMInterface:
             text: The text to embed
             
         Returns:
-            Simulated embedding vector
+            Simulated unit-length float32 embedding vector
         """
-        import hashlib
-        import random
-        
-        # Create a hash of the text for consistency
-        hash_obj = hashlib.md5(text.encode())
-        hash_hex = hash_obj.hexdigest()
-        
-        # Use the hash to seed the random generator
-        random.seed(hash_hex)
-        
-        # Generate 10-dimensional embeddings vector
-        embeddings = [random.random() for _ in range(10)]
-        
-        return embeddings
+        # Same text, same vector, so simulated similarity searches are repeatable
+        return _simulated_embedding(text)
     
     def _simulate_response(self, prompt: str) -> str:
         """Simulate LLM response for demonstration purposes"""
         
-        # Basic response templates based on prompt content
-        if "summarize" in prompt.lower():
-            return "This is a simulated summary of the conversation. The customer was experiencing login issues with their account. The agent sent a password reset link to the customer's email, and the customer confirmed they would check their email."
-        
-        elif "action" in prompt.lower() or "extract" in prompt.lower():
-            return """
-            {
-                "action_items": [
-                    {
-                        "action": "Send password reset link to customer",
-                        "priority": "High",
-                        "status": "Completed"
-                    },
-                    {
-                        "action": "Follow up with customer to confirm successful login",
-                        "priority": "Medium",
-                        "status": "Pending"
-                    }
-                ],
-                "total_actions": 2
-            }
-            """
-        
-        elif "route" in prompt.lower() or "team" in prompt.lower():
-            return """
-            {
-                "recommended_team": "Account Management",
-                "confidence": "High",
-                "justification": "This is an account access issue related to password problems.",
-                "timestamp": "2023-06-15 10:15:00"
-            }
-            """
-        
-        elif "resolution" in prompt.lower() or "recommend" in prompt.lower():
-            return """
-            {
-                "immediate_steps": [
-                    {"action": "Verify refund status", "details": "Check if refund has been processed"},
-                    {"action": "Send confirmation email", "details": "Ensure customer receives refund confirmation"}
-                ],
-                "complete_resolution_path": [
-                    {"action": "Monitor account", "details": "Watch for any similar issues"},
-                    {"action": "Update documentation", "details": "Document the resolution process"}
-                ],
-                "reasoning": "Password reset is the standard procedure for login issues when the customer cannot access their account.",
-                "confidence_score": 0.85
-            }
-            """
+        # Basic response templates based on prompt content, lowercasing the prompt once
+        prompt = prompt.lower()
+        for keywords, response in _SIMULATED_RESPONSES:
+            if any(keyword in prompt for keyword in keywords):
+                return response
+        return _SIMULATED_DEFAULT
+    
+    def batch_generate(self, prompts: List[str], concurrency: int = 8, **kwargs) -> List[str]:
+        """
+        Generate responses for multiple prompts, concurrently when aiohttp is available
         
-        elif "time" in prompt.lower() or "predict" in prompt.lower():
-            return """
-            {
-                "resolution_time_category": "quick",
-                "estimated_time": "2 hours",
-                "explanation": "Simple issue with standard resolution path."
-            }
-            """
+        Must not be called from a running event loop; await abatch_generate there instead.
         
-        else:
-            return "I'm not sure how to respond to that prompt."
+        Args:
+            prompts: The input prompts
+            concurrency: Maximum number of requests in flight at once
+            **kwargs: Passed on to the generate call
             
-    def batch_generate(self, prompts: List[str], **kwargs) -> List[str]:
-        """Generate responses for multiple prompts"""
-        return [self.generate_response(prompt, **kwargs) for prompt in prompts] 
\ No newline at end of file
+        Returns:
+            The generated responses, in the same order as the prompts
+        """
+        kwargs.pop("use_openrouter", None)
+        if self.simulate or aiohttp is None or len(prompts) < 2:
+            return [self.generate_response(prompt, **kwargs) for prompt in prompts]
+        return asyncio.run(self.abatch_generate(prompts, concurrency=concurrency, **kwargs))
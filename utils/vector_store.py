@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+try:
+    import chromadb
+    import chromadb.errors
+except ImportError:
+    # Optional; only needed by ChromaVectorStore
+    chromadb = None
+
+# Raised by older Chroma versions (hnswlib directly, or NotEnoughElementsException) when
+# n_results exceeds the number of entries matching a filter; newer ones return fewer results
+_NOT_ENOUGH_RESULTS = (RuntimeError,)
+if chromadb is not None and hasattr(chromadb.errors, "NotEnoughElementsException"):
+    _NOT_ENOUGH_RESULTS += (chromadb.errors.NotEnoughElementsException,)
+
+class VectorStore(ABC):
+    """
+    Interface for an external embedding index used by Database
+    
+    SQLite stays the system of record; a vector store only mirrors the embeddings
+    so that similarity search can use an approximate nearest neighbour index.
+    Vectors passed in are already L2-normalized float32 arrays.
+    """
+    
+    @abstractmethod
+    def add(self, embedding_id: int, source_type: str, source_id: str, text: str, vector: np.ndarray) -> None:
+        """
+        Add an embedding to the index, replacing any entry with the same ID
+        
+        Args:
+            embedding_id: Row ID of the embedding in the SQLite embeddings table
+            source_type: Type of the source (e.g., "conversation", "historical_data")
+            source_id: ID of the source (e.g., conversation_id, record_id)
+            text: The text that was embedded
+            vector: The normalized embedding vector
+        """
+    
+    @abstractmethod
+    def search(self, vector: np.ndarray, source_type: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the embeddings most similar to a query vector
+        
+        Args:
+            vector: The normalized query vector
+            source_type: Optional filter for source type
+            limit: Maximum number of results to return
+        
+        Returns:
+            List of similar items with source_type, source_id, text and similarity (cosine)
+        """
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by a persistent ChromaDB client (HNSW index)"""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the Chroma vector store
+        
+        Args:
+            path: Directory for the persistent Chroma database
+        """
+        if chromadb is None:
+            raise ImportError("ChromaVectorStore requires the chromadb package")
+        
+        self._client = chromadb.PersistentClient(path=path)
+        
+        # One collection per vector dimension, since an index has a fixed dimension
+        self._collections: Dict[int, Any] = {}
+    
+    def _collection(self, dim: int) -> Any:
+        """Get the inner-product collection for a vector dimension, creating it on first use"""
+        collection = self._collections.get(dim)
+        if collection is None:
+            collection = self._client.get_or_create_collection(
+                name=f"embeddings_{dim}",
+                metadata={"hnsw:space": "ip"}
+            )
+            self._collections[dim] = collection
+        return collection
+    
+    def add(self, embedding_id: int, source_type: str, source_id: str, text: str, vector: np.ndarray) -> None:
+        # Upsert so that re-running sync_vector_store over stored embeddings is harmless
+        self._collection(vector.size).upsert(
+            ids=[str(embedding_id)],
+            embeddings=[vector.tolist()],
+            metadatas=[{"source_type": source_type or "", "source_id": source_id or ""}],
+            documents=[text or ""]
+        )
+    
+    def search(self, vector: np.ndarray, source_type: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        collection = self._collection(vector.size)
+        limit = min(limit, collection.count())
+        if limit <= 0:
+            return []
+        
+        # Counting the entries that match the filter would fetch all their IDs, so instead
+        # retry with fewer results when an older Chroma rejects n_results
+        while True:
+            try:
+                result = collection.query(
+                    query_embeddings=[vector.tolist()],
+                    n_results=limit,
+                    where={"source_type": source_type} if source_type else None
+                )
+                break
+            except _NOT_ENOUGH_RESULTS:
+                if limit <= 1:
+                    return []
+                limit -= 1
+        
+        # Chroma's "ip" space reports distance as 1 - inner product
+        return [
+            {
+                "source_type": metadata["source_type"],
+                "source_id": metadata["source_id"],
+                "text": document,
+                "similarity": 1.0 - distance
+            }
+            for metadata, document, distance in zip(result["metadatas"][0], result["documents"][0], result["distances"][0])
+        ]